@@ -0,0 +1,100 @@
+"""Benchmark the cheapest incremental DH refresh against a full recompute.
+
+An incremental refresh has to find the new and changed records of an export
+before it can fold them into per-work-center counters. Each DH export is a
+near-complete dump, so that diff still visits every row of the new export.
+This times its cheapest form against `get_data_dh_metrics`, which recomputes
+every counter in one scan. The diff hashes the columns the counters depend on
+and probes the previous export's hashes; folding in the few changed rows
+afterwards is not timed. The histories are synthetic, built from the bundled
+export, with `--changed` records closed and as many new ones added.
+
+Usage:
+    python -m benchmarks.bench_dh_incremental [--sizes 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import polars as pl
+
+from src.services.dh_data_service import get_data_dh_metrics, read_data_dh
+
+SAMPLE = "assets/DH_2025-10-07_16-38_Packer21_Maker21.csv"
+
+# Columns `dh_counter_flags` reads, plus the record key
+TRACKED = [
+    "NUMBER",
+    "WORK CENTER TYPE",
+    "STATUS",
+    "PRIORITY",
+    "INSPECTION CATEGORIES",
+    "DEFECT TYPES",
+    "DEFECT COUNTERMEASURES",
+]
+
+
+def make_exports(sample, size, changed):
+    # Two successive exports: `changed` records closed, `changed` new ones
+    previous = sample.sample(size, with_replacement=True, seed=size).with_columns(
+        pl.format("DH{}", pl.int_range(pl.len())).alias("NUMBER")
+    )
+    closed = pl.int_range(pl.len()) % (size // changed) == 0
+    current = pl.concat(
+        [
+            sample.head(changed).with_columns(
+                pl.format("NEW{}", pl.int_range(pl.len())).alias("NUMBER")
+            ),
+            previous.with_columns(
+                pl.when(closed)
+                .then(pl.lit("CLOSED", previous.schema["STATUS"]))
+                .otherwise(pl.col("STATUS"))
+                .alias("STATUS")
+            ),
+        ]
+    )
+    return previous, current
+
+
+def changed_records(previous_hashes, current):
+    hashes = current.select(TRACKED).hash_rows()
+    return current.filter(~hashes.is_in(previous_hashes.implode()))
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--changed", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sample = read_data_dh(SAMPLE)
+    print(f"{'rows':>10} {'recompute ms':>13} {'diff only ms':>13} {'ratio':>6}")
+    for size in args.sizes:
+        previous, current = make_exports(sample, size, args.changed)
+        previous_hashes = previous.select(TRACKED).hash_rows()
+        full_s, _ = best_of(lambda: get_data_dh_metrics(current), args.repeat)
+        diff_s, delta = best_of(
+            lambda: changed_records(previous_hashes, current), args.repeat
+        )
+        # closed records that were already CLOSED are not changes
+        assert args.changed <= delta.height <= 2 * args.changed, delta.height
+        print(
+            f"{size:>10} {full_s * 1000:>13.2f} {diff_s * 1000:>13.2f}"
+            f" {diff_s / full_s:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
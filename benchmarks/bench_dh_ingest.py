@@ -0,0 +1,80 @@
+"""Benchmark DH ingestion: legacy eager read vs. projected lazy scan.
+
+Scales the bundled DH export 100x and times both loaders.
+
+Usage:
+    python -m benchmarks.bench_dh_ingest [--scale 100] [--repeat 5]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from src.services.dh_data_service import (
+    DH_SCHEMA,
+    read_data_dh,
+    sort_dh_by_reported_at,
+)
+from src.utils.helpers import safe_read_csv
+
+SAMPLE = Path("assets/DH_2025-10-07_16-38_Packer21_Maker21.csv")
+
+
+def legacy_read_data_dh(path):
+    # The loader as it was before the fixed-schema scan
+    df = safe_read_csv(path, infer_schema_length=None, try_parse_dates=True)
+    return df[list(DH_SCHEMA)].clone()
+
+
+def make_scaled_copy(folder: Path, scale: int) -> Path:
+    lines = SAMPLE.read_text(encoding="utf-8-sig").splitlines(keepends=True)
+    header, body = lines[0], "".join(lines[1:])
+    if not body.endswith("\n"):
+        body += "\n"
+    target = folder / f"dh_x{scale}.csv"
+    with target.open("w", encoding="utf-8") as handle:
+        handle.write(header)
+        for _ in range(scale):
+            handle.write(body)
+    return target
+
+
+def best_of(fn, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = fn(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_scaled_copy(Path(tmp), args.scale)
+        size_mb = path.stat().st_size / 1e6
+
+        legacy_s, legacy_df = best_of(legacy_read_data_dh, path, args.repeat)
+        scan_s, scan_df = best_of(read_data_dh, path, args.repeat)
+
+        # read_data_dh orders by REPORTED AT and stores low-cardinality
+        # columns as Enum/Categorical; compare the same rows as plain text
+        as_text = pl.col(pl.Enum, pl.Categorical).cast(pl.String)
+        assert sort_dh_by_reported_at(legacy_df).equals(
+            scan_df.with_columns(as_text)
+        ), "loaders disagree"
+        print(f"file: {legacy_df.height} rows, {size_mb:.1f} MB")
+        print(f"legacy read_csv (infer all): {legacy_s * 1000:8.1f} ms")
+        print(f"scan_csv fixed schema      : {scan_s * 1000:8.1f} ms")
+        print(f"speedup                    : {legacy_s / scan_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark DH metrics: legacy filter/group_by chain vs. single-pass plan.
+
+Builds synthetic DH frames from the bundled export (1k to 1M rows) and times
+`get_data_dh_metrics` against the pre-engine implementation.
+
+Usage:
+    python -m benchmarks.bench_dh_metrics [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import polars as pl
+
+from src.services.dh_data_service import (
+    COMPONENT_CATEGORIES,
+    get_data_dh_metrics,
+    read_data_dh,
+)
+
+SAMPLE = "assets/DH_2025-10-07_16-38_Packer21_Maker21.csv"
+
+
+def legacy_get_data_dh_metrics(df: pl.DataFrame):
+    # The metrics as computed before the single-pass engine (pl.count -> pl.len)
+    df_component = df.filter(
+        pl.col("INSPECTION CATEGORIES").is_in(COMPONENT_CATEGORIES)
+    )
+    dh_component_found = df_component.group_by("WORK CENTER TYPE").agg(
+        pl.len().alias("COUNT")
+    )
+    data_dh_component = {"FOUND": int(dh_component_found["COUNT"].sum())}
+    for row in dh_component_found.to_dicts():
+        data_dh_component[f"  - {row['WORK CENTER TYPE']}"] = row["COUNT"]
+    data_dh_component["FIX"] = df_component.filter(pl.col("STATUS") == "CLOSED").height
+
+    dh_found_found = df.group_by("WORK CENTER TYPE").agg(pl.len().alias("COUNT"))
+    data_dh_found = {"FOUND": int(dh_found_found["COUNT"].sum())}
+    for row in dh_found_found.to_dicts():
+        data_dh_found[f"  - {row['WORK CENTER TYPE']}"] = row["COUNT"]
+    dh_found_high = df.filter(pl.col("PRIORITY") == "HIGH")
+    data_dh_found["HIGH"] = dh_found_high.height
+
+    dh_open_found = (
+        df.filter(pl.col("STATUS") == "OPEN")
+        .group_by("WORK CENTER TYPE")
+        .agg(pl.len().alias("COUNT"))
+    )
+    data_dh_open = {"DH OPEN": int(dh_open_found["COUNT"].sum())}
+    total_dh_high = dh_found_high.height
+    dh_high_with_cm = dh_found_high.filter(
+        pl.col("DEFECT COUNTERMEASURES") != ""
+    ).height
+    data_dh_open["% HIGH CM"] = 100 * (
+        dh_high_with_cm / total_dh_high if total_dh_high != 0 else 0
+    )
+
+    dh_soc_found = df.filter(
+        pl.col("DEFECT TYPES").str.contains("SOURCE_OF_CONTAMINATION")
+    )
+    data_dh_soc = {
+        "FOUND": dh_soc_found.height,
+        "FIX": dh_soc_found.filter(pl.col("STATUS") == "CLOSED").height,
+    }
+    return {
+        "DH COMPONENT": data_dh_component,
+        "DH FOUND": data_dh_found,
+        "DH OPEN": data_dh_open,
+        "DH SOC": data_dh_soc,
+    }
+
+
+def best_of(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    sample = read_data_dh(SAMPLE)
+    print(f"{'rows':>10} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8}")
+    for size in args.sizes:
+        df = sample.sample(size, with_replacement=True, seed=size)
+        legacy_s, expected = best_of(legacy_get_data_dh_metrics, df, args.repeat)
+        engine_s, actual = best_of(get_data_dh_metrics, df, args.repeat)
+        assert expected == actual, "metrics disagree"
+        print(
+            f"{size:>10} {legacy_s * 1000:>10.2f} {engine_s * 1000:>15.2f}"
+            f" {legacy_s / engine_s:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark MPS DATE normalization: Python loop vs. polars formats.
+
+Builds a synthetic String column mixing every supported DATE format (plus
+blanks and junk) and times `convert_date_values` against
+`normalize_date_column`.
+
+Usage:
+    python -m benchmarks.bench_mps_dates [--rows 500000] [--repeat 3]
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+import polars as pl
+
+from src.services.mps_data_service import (
+    MPS_DATE_FORMATS,
+    convert_date_values,
+    normalize_date_column,
+)
+
+
+def make_column(rows: int, seed: int = 7) -> pl.Series:
+    rng = random.Random(seed)
+    start = datetime.datetime(2020, 1, 1)
+    odd = ["", "  ", "n/a", "31/02/2024", None]
+    values = []
+    for _ in range(rows):
+        if rng.random() < 0.02:
+            values.append(rng.choice(odd))
+            continue
+        stamp = start + datetime.timedelta(days=rng.randrange(3650))
+        text = stamp.strftime(rng.choice(MPS_DATE_FORMATS))
+        values.append(f" {text} " if rng.random() < 0.05 else text)
+    return pl.Series("DATE", values, dtype=pl.String)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    column = make_column(args.rows)
+    loop_s, loop_vals = best_of(
+        lambda: pl.Series("DATE", convert_date_values(column.to_list())),
+        args.repeat,
+    )
+    expr_s, expr_vals = best_of(lambda: normalize_date_column(column), args.repeat)
+
+    assert loop_vals.dtype == expr_vals.dtype == pl.Date
+    assert loop_vals.equals(expr_vals), "normalizers disagree"
+    print(f"column: {args.rows} rows, {expr_vals.null_count()} unparseable")
+    print(f"python loop (strptime)  : {loop_s * 1000:8.1f} ms")
+    print(f"polars coalesced formats: {expr_s * 1000:8.1f} ms")
+    print(f"speedup                 : {loop_s / expr_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
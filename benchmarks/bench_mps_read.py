@@ -0,0 +1,72 @@
+"""Benchmark the MPS Tracking sheet read: full inference vs. one text read.
+
+Times the legacy loader (whole sheet, full inference, Python header walk)
+against `read_excel_with_dynamic_header` (whole sheet read once as text,
+header found in the first column, report columns selected) on the bundled
+MPS workbooks.
+
+Usage:
+    python -m benchmarks.bench_mps_read [--repeat 5]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import polars as pl
+
+from src.services import mps_data_service as mps
+from src.utils.helpers import safe_read_excel
+
+WORKBOOKS = sorted(Path("assets").glob("[0-9]*-MPS board Print.xlsx"))
+
+
+def legacy_read_tracking(path, sheet="Tracking", header_token="DATE"):
+    # The reader as it was before the header probe
+    full_df = safe_read_excel(path, sheet_name=sheet, infer_schema_length=None)
+    header_row_idx = 0
+    for i in range(full_df.height):
+        first_val = full_df[i, 0]
+        if isinstance(first_val, str) and first_val.upper() == header_token:
+            header_row_idx = i
+            break
+    df = full_df.slice(header_row_idx + 1)
+    df.columns = [str(h) for h in full_df.row(header_row_idx)]
+    return full_df, df.select(mps.MPS_COLUMNS)
+
+
+def text_read_tracking(path):
+    return mps.read_excel_with_dynamic_header(
+        str(path), sheet="Tracking", columns=mps.MPS_COLUMNS
+    )
+
+
+def best_of(fn, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for path in WORKBOOKS:
+        legacy_s, (full_df, legacy_df) = best_of(
+            legacy_read_tracking, path, args.repeat
+        )
+        text_s, text_df = best_of(text_read_tracking, path, args.repeat)
+
+        has_date = pl.col("DATE").is_not_null()
+        assert legacy_df.filter(has_date).equals(text_df.filter(has_date))
+        print(path.name)
+        print(f"  legacy full sheet : {legacy_s * 1000:8.1f} ms")
+        print(f"  one text read     : {text_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
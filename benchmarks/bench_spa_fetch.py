@@ -0,0 +1,131 @@
+"""Benchmark SPA fetch latency: client per request vs. pooled NTLM client.
+
+Starts a local stand-in for the SPA server (HTTP/1.1 keep-alive, NTLM
+bound to the connection like IIS, serving a bundled loss-tree page) and
+times 1 and N sequential fetches with the old fetch (new `AsyncClient`
+and full NTLM handshake per request) against `SPAClientPool`. `--delay-ms`
+adds a server-side delay to every response to mimic network round trips.
+The stand-in speaks plain HTTP, so TLS setup and CA loading, which the
+pool also saves, are not part of these numbers.
+
+Usage:
+    python -m benchmarks.bench_spa_fetch [--fetches 50] [--delay-ms 2]
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import spnego
+from httpx_ntlm import HttpNtlmAuth
+
+from src.services.rnm_data_service import fetch_rnm_data
+from src.services.spa_client import HEADERS, SPAClientPool
+
+USERNAME, PASSWORD = "PMI\\champion", "secret"
+PAGE = Path("assets/spa/1.html").read_bytes()
+
+
+class NTLMStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    stats = {"connections": 0, "handshakes": 0}
+
+    def setup(self):
+        super().setup()
+        self.ntlm = None
+        self.authenticated = False
+        self.stats["connections"] += 1
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        header = self.headers.get("Authorization", "")
+        if not self.authenticated:
+            if not header.startswith("NTLM ") or self.ntlm is None:
+                self.ntlm = spnego.server(protocol="ntlm")
+                return self._reply(401, b"", {"WWW-Authenticate": "NTLM"})
+            token = self.ntlm.step(base64.b64decode(header[5:]))
+            if not self.ntlm.complete:
+                challenge = base64.b64encode(token).decode("ascii")
+                return self._reply(401, b"", {"WWW-Authenticate": f"NTLM {challenge}"})
+            self.authenticated = True
+            self.stats["handshakes"] += 1
+        self._reply(200, PAGE, {"Content-Type": "text/html; charset=utf-8"})
+
+    def _reply(self, status, body, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def fetch_with_new_client(url):
+    # fetch_rnm_data as it was before the pool
+    async with httpx.AsyncClient(
+        auth=HttpNtlmAuth(USERNAME, PASSWORD), headers=HEADERS, verify=False
+    ) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.text
+
+
+async def time_fetches(url, fetches, pooled):
+    pool = SPAClientPool()
+    NTLMStandIn.stats.update(connections=0, handshakes=0)
+    start = time.perf_counter()
+    for _ in range(fetches):
+        if pooled:
+            text = await fetch_rnm_data(url, USERNAME, PASSWORD, pool=pool)
+        else:
+            text = await fetch_with_new_client(url)
+        assert len(text) == len(PAGE.decode("utf-8"))
+    elapsed = time.perf_counter() - start
+    await pool.aclose()
+    return elapsed, dict(NTLMStandIn.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fetches", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        users = os.path.join(tmp, "ntlm_users.txt")
+        Path(users).write_text(f"{USERNAME.replace('\\', ':')}:{PASSWORD}\n")
+        os.environ["NTLM_USER_FILE"] = users
+        NTLMStandIn.delay = args.delay_ms / 1000
+        server = ThreadingHTTPServer(("127.0.0.1", 0), NTLMStandIn)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/db.aspx"
+        try:
+            # Warm up imports and the NTLM crypto before timing anything
+            asyncio.run(fetch_with_new_client(url))
+            print(f"stand-in delay per response: {args.delay_ms} ms")
+            for fetches in (1, args.fetches):
+                for label, pooled in (("client per fetch", False), ("pooled", True)):
+                    elapsed, stats = asyncio.run(time_fetches(url, fetches, pooled))
+                    print(
+                        f"{fetches:3d} x {label:16}: {elapsed * 1000:8.1f} ms total, "
+                        f"{elapsed * 1000 / fetches:6.1f} ms/fetch, "
+                        f"{stats['connections']} connections, "
+                        f"{stats['handshakes']} NTLM handshakes"
+                    )
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark SPA loss-tree table extraction: BeautifulSoup tree vs. stream.
+
+Times the BeautifulSoup loader (full ``html.parser`` tree, ``find_all`` and
+``get_text`` per cell, row-oriented frames) against the streaming extractor
+on the bundled SPA pages, checking both return the same relevant tables.
+Also times reading the net production through the full `scrape_data_spa`
+pipeline against the summary-cell scan.
+
+Usage:
+    python -m benchmarks.bench_spa_parse [--repeat 5]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import polars as pl
+from bs4 import BeautifulSoup
+
+from src.utils import spa_processor as spa
+
+PAGES = sorted(Path("assets/spa").glob("*.html"))
+
+
+def legacy_relevant_tables(html):
+    # The extractor as it was before the streaming parser
+    soup = BeautifulSoup(html, "html.parser")
+    tables = []
+    for table in soup.find_all("table"):
+        data = [
+            [cell.get_text(strip=True) for cell in row.find_all(["td", "th"])]
+            for row in table.find_all("tr")
+        ]
+        data = [row for row in data if row and not all(c == "" for c in row)]
+        if not data:
+            continue
+        max_cols = max(len(row) for row in data)
+        normalized = [row + [""] * (max_cols - len(row)) for row in data]
+        headers = [str(j) for j in range(max_cols)]
+        tables.append(pl.DataFrame(normalized, schema=headers, orient="row"))
+    return [t for t in tables if t.height > spa.RELEVANT_MIN_ROWS]
+
+
+def stream_relevant_tables(html):
+    return spa.extract_tables(html, min_rows=spa.RELEVANT_MIN_ROWS)
+
+
+def pipeline_net_production(html):
+    return spa.net_production_from_tables(spa.scrape_data_spa(html=html))
+
+
+def best_of(fn, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(html)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    total_legacy = total_stream = total_pipeline = total_scan = 0.0
+    for path in PAGES:
+        html = path.read_text(encoding="utf-8")
+        legacy_s, legacy = best_of(legacy_relevant_tables, html, args.repeat)
+        stream_s, stream = best_of(stream_relevant_tables, html, args.repeat)
+
+        assert len(legacy) == len(stream), f"{path.name}: table count differs"
+        assert all(a.equals(b) for a, b in zip(legacy, stream)), path.name
+        pipeline_s, pipeline = best_of(pipeline_net_production, html, args.repeat)
+        scan_s, scan = best_of(spa.find_net_production, html, args.repeat)
+
+        assert pipeline == scan, f"{path.name}: net production differs"
+        total_legacy += legacy_s
+        total_stream += stream_s
+        total_pipeline += pipeline_s
+        total_scan += scan_s
+        print(
+            f"{path.name:16} {len(html) / 1024:6.0f} KB  "
+            f"bs4 {legacy_s * 1000:7.1f} ms  stream {stream_s * 1000:7.1f} ms  "
+            f"({len(stream)} relevant tables)"
+        )
+    print(f"total bs4 tree : {total_legacy * 1000:8.1f} ms")
+    print(f"total streaming: {total_stream * 1000:8.1f} ms")
+    print(f"speedup        : {total_legacy / total_stream:8.1f}x")
+    print(f"net production via pipeline: {total_pipeline * 1000:8.1f} ms")
+    print(f"net production via scan    : {total_scan * 1000:8.2f} ms")
+    print(f"speedup                    : {total_pipeline / total_scan:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
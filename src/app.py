@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 
+import asyncio
 import tkinter as tk
 
 from typing import Optional
@@ -8,6 +9,7 @@ from typing import Optional
 import ttkbootstrap as ttk
 from PIL import Image, ImageTk
 from src.components.side_tab_notebook import SideTabNotebook
+from src.services.spa_client import SPA_CLIENTS
 
 from src.ui.bde_ui import BDEUI
 from src.ui.dh_ui import DHUI
@@ -23,6 +25,7 @@ class App:
         self.root.geometry("1200x670")
         self.root.minsize(1200, 670)
         self.root.iconbitmap(resource_path("assets/pm.ico"))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Top header
         header = ttk.Frame(self.root, padding=6)
@@ -147,6 +150,17 @@ class App:
             ]
         self.populate_data_tree(filtered)
 
+    def on_close(self) -> None:
+        """Close pooled SPA connections, then the window."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Plain Tk mainloop: no async client can have been opened
+            self.root.destroy()
+            return
+        task = loop.create_task(SPA_CLIENTS.aclose())
+        task.add_done_callback(lambda _: self.root.destroy())
+
     def apply_theme(self) -> None:
         theme = self.theme_var.get()
         try:
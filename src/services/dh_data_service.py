@@ -1,223 +1,419 @@
+import os
+import re
 import polars as pl
-from ..utils.helpers import safe_read_csv
+from ..utils.frame_cache import FrameCache, file_fingerprint
+from ..utils.helpers import parse_datetime_formats
 from tabulate import tabulate
-from datetime import datetime
-
-
-def read_data_dh(path: str = None) -> pl.DataFrame:
-    # read the csv file use polars
-    # Force polars to examine the entire file when inferring dtypes. This helps
-    # avoid warnings like "Could not determine dtype for column N" when
-    # columns contain mixed types beyond the default sample range.
-    # Ask polars to try parsing dates during CSV read and infer schema from whole file
-    df = safe_read_csv(path, infer_schema_length=None, try_parse_dates=True)
-    df = df[
-        [
-            "NUMBER",
-            "STATUS",
-            "WORK CENTER TYPE",
-            "DEFECT TYPES",
-            "DEFECT COUNTERMEASURES",
-            "PRIORITY",
-            "DESCRIPTION",
-            "FOUND DURING",
-            "INSPECTION CATEGORIES",
-            "REPORTED AT",
-        ]
-    ]
+from datetime import date, datetime
+from typing import Iterable
+
+# Bump whenever read_data_dh changes the columns/dtypes it returns so frames
+# cached by an older build are not reused.
+DH_SCHEMA_VERSION = 5
+
+# Columns kept from the DH export (49 columns) and the dtype each is read as.
+# Everything is read as text; `REPORTED AT` is parsed from text inside the scan.
+# Open-ended low-cardinality columns are stored as Categorical.
+DH_SCHEMA: dict[str, pl.DataType] = {
+    "NUMBER": pl.String,
+    "STATUS": pl.String,
+    "WORK CENTER TYPE": pl.Categorical,
+    "DEFECT TYPES": pl.String,
+    "DEFECT COUNTERMEASURES": pl.String,
+    "PRIORITY": pl.String,
+    "DESCRIPTION": pl.String,
+    "FOUND DURING": pl.Categorical,
+    "INSPECTION CATEGORIES": pl.Categorical,
+    "REPORTED AT": pl.Datetime("us"),
+}
+
+# Columns with a known set of values, loaded as `pl.Enum` so filters and
+# group-bys work on integer codes. A column holding any value outside its
+# domain keeps the String dtype instead.
+DH_ENUM_DOMAINS: dict[str, list[str]] = {
+    "STATUS": ["OPEN", "ASSIGNED", "CLOSED"],
+    "PRIORITY": ["HIGH", "MEDIUM", "LOW"],
+}
+
+# `REPORTED AT` formats in priority order. DH exports write `dd/mm/YYYY HH:MM`;
+# the others cover files re-saved by Excel or written by hand.
+REPORTED_AT_FORMATS = (
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+)
+
+
+def read_data_dh(path: str = None, cache: FrameCache | None = None) -> pl.DataFrame:
+    # Serve repeat loads of an unchanged export from the columnar cache
+    if cache is not None:
+        return cache.get_or_load(path, _parse_data_dh)
+    return _parse_data_dh(path)
+
+
+def scan_data_dh(path: str) -> pl.LazyFrame:
+    """Lazily scan a DH export, projecting only the `DH_SCHEMA` columns.
+
+    Schema inference is disabled so no column is sampled or type-guessed;
+    the projection is pushed into the CSV reader, so unused columns such as
+    `KEY NOTES / OBSERVATIONS` or `DELETED *` are never materialized.
+    Columns missing from the export come back as typed nulls.
+    """
+    lf = pl.scan_csv(path, infer_schema=False)
+    available = set(lf.collect_schema().names())
+
+    exprs = []
+    for col, dtype in DH_SCHEMA.items():
+        if col not in available:
+            exprs.append(pl.lit(None, dtype=dtype).alias(col))
+        elif col == "REPORTED AT":
+            exprs.append(
+                parse_datetime_formats(pl.col(col), REPORTED_AT_FORMATS).alias(col)
+            )
+        else:
+            exprs.append(pl.col(col).cast(dtype))
+    return lf.select(exprs)
+
+
+def with_dh_enums(df: pl.DataFrame) -> pl.DataFrame:
+    """Cast the `DH_ENUM_DOMAINS` columns to Enum where every value fits."""
+    candidates = {
+        col: domain
+        for col, domain in DH_ENUM_DOMAINS.items()
+        if col in df.columns and df.schema[col] == pl.String
+    }
+    if not candidates:
+        return df
+    fits = df.select(
+        (pl.col(col).is_in(domain) | pl.col(col).is_null()).all()
+        for col, domain in candidates.items()
+    ).row(0, named=True)
+    return df.cast(
+        {col: pl.Enum(domain) for col, domain in candidates.items() if fits[col]}
+    )
 
-    return df.clone()
 
+def sort_dh_by_reported_at(df: pl.DataFrame) -> pl.DataFrame:
+    """Order DH records newest first by `REPORTED AT`, undated records last.
 
-def get_data_dh_metrics(df: pl.DataFrame):
-    # Precompute commonly used masks and grouped counts to avoid repeated filters
-    component_categories = [
-        "Fasteners",
-        "MechanicalDrives&Transmissions",
-        "Pneumatic/SteamSystems",
-        "GluingSystems",
-        "ElectromechanicSystems",
-    ]
+    Exports are not reliably in this order, so the OPEN/HIGH detail lists of
+    the report follow `REPORTED AT` rather than the row order of the file.
 
-    # component-level dataframe and aggregated counts
-    df_component = df.filter(
-        pl.col("INSPECTION CATEGORIES").is_in(component_categories)
-    )
-    dh_component_found = (
-        df_component.group_by("WORK CENTER TYPE")
-        .agg(pl.count().alias("COUNT"))
-        .with_columns(pl.col("WORK CENTER TYPE").alias("WORK CENTER"))
-        .select(["WORK CENTER", "COUNT"])
-    )
+    Loaded frames are kept in this order so `DHTimeIndex` can binary-search
+    `REPORTED AT` instead of filtering the whole column.
+    """
+    return df.sort("REPORTED AT", descending=True, nulls_last=True, maintain_order=True)
 
-    data_dh_component = {}
-    data_dh_component["FOUND"] = (
-        int(dh_component_found["COUNT"].sum()) if dh_component_found.height > 0 else 0
-    )
-    for row in dh_component_found.to_dicts():
-        data_dh_component[f"  - {row['WORK CENTER']}"] = row["COUNT"]
-    data_dh_component["FIX"] = int(
-        df_component.filter(pl.col("STATUS") == "CLOSED").height
-    )
 
-    # overall counts grouped by work center (reuse)
-    dh_found_found = (
-        df.group_by("WORK CENTER TYPE")
-        .agg(pl.count().alias("COUNT"))
-        .with_columns(pl.col("WORK CENTER TYPE").alias("WORK CENTER"))
-        .select(["WORK CENTER", "COUNT"])
-    )
-    data_dh_found = {}
-    data_dh_found["FOUND"] = (
-        int(dh_found_found["COUNT"].sum()) if dh_found_found.height > 0 else 0
+def _finish_data_dh(df: pl.DataFrame) -> pl.DataFrame:
+    # The frame `read_data_dh` returns (and caches) for one collected export
+    return sort_dh_by_reported_at(with_dh_enums(df))
+
+
+def _parse_data_dh(path: str) -> pl.DataFrame:
+    return _finish_data_dh(scan_data_dh(path).collect())
+
+
+# DH export file names carry their export time, e.g. DH_2025-10-07_16-38_*.csv
+_EXPORT_STAMP = re.compile(r"DH_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2})")
+
+
+def dh_export_time(path: str) -> datetime:
+    """Return when a DH export was produced.
+
+    Uses the timestamp in the export file name and falls back to the file's
+    modification time for renamed files.
+    """
+    match = _EXPORT_STAMP.search(os.path.basename(path))
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y-%m-%d_%H-%M")
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def read_data_dh_many(
+    paths: Iterable[str], cache: FrameCache | None = None
+) -> pl.DataFrame:
+    """Read several DH exports at once and merge them into one frame.
+
+    All uncached files are scanned in a single `pl.collect_all` call so polars
+    parses them concurrently. Exports usually overlap, so records are
+    de-duplicated on `NUMBER`, keeping the row from the newest export (its
+    STATUS is the current one). The result is sorted by `REPORTED AT`.
+    Each file is cached exactly as `read_data_dh` would return it, so the
+    two functions can share one `cache`.
+    """
+    ordered = sorted(paths, key=dh_export_time, reverse=True)
+    if not ordered:
+        return pl.DataFrame(schema=DH_SCHEMA)
+
+    frames: list[pl.DataFrame | None] = [
+        cache.get(p) if cache is not None else None for p in ordered
+    ]
+    misses = [i for i, df in enumerate(frames) if df is None]
+    fingerprints = {i: file_fingerprint(ordered[i]) for i in misses}
+    parsed = pl.collect_all([scan_data_dh(ordered[i]) for i in misses])
+    for i, df in zip(misses, parsed):
+        frames[i] = _finish_data_dh(df)
+        if cache is not None:
+            cache.put(ordered[i], frames[i], fingerprint=fingerprints[i])
+
+    # An export with out-of-domain values keeps String columns; relaxed concat
+    # falls back to String and the merged frame is re-checked below.
+    combined = pl.concat(frames, how="vertical_relaxed")
+    combined = combined.filter(
+        pl.col("NUMBER").is_null() | pl.col("NUMBER").is_first_distinct()
     )
-    for row in dh_found_found.to_dicts():
-        data_dh_found[f"  - {row['WORK CENTER']}"] = row["COUNT"]
+    return sort_dh_by_reported_at(with_dh_enums(combined))
+
+
+# INSPECTION CATEGORIES counted as "DH COMPONENT"
+COMPONENT_CATEGORIES = [
+    "Fasteners",
+    "MechanicalDrives&Transmissions",
+    "Pneumatic/SteamSystems",
+    "GluingSystems",
+    "ElectromechanicSystems",
+]
+
+# Per-work-center counters every DH metric section is derived from
+DH_COUNTERS = [
+    "FOUND",
+    "COMPONENT FOUND",
+    "COMPONENT FIX",
+    "OPEN",
+    "HIGH",
+    "HIGH CM",
+    "SOC FOUND",
+    "SOC FIX",
+]
+
+
+def dh_counter_flags() -> list[pl.Expr]:
+    """Return one boolean expression per `DH_COUNTERS` entry for a DH row.
+
+    Null comparisons count as False, matching what `filter` used to drop.
+    """
+    component = pl.col("INSPECTION CATEGORIES").is_in(COMPONENT_CATEGORIES)
+    closed = pl.col("STATUS") == "CLOSED"
+    high = pl.col("PRIORITY") == "HIGH"
+    soc = pl.col("DEFECT TYPES").str.contains("SOURCE_OF_CONTAMINATION")
+    flags = [
+        pl.lit(True),
+        component,
+        component & closed,
+        pl.col("STATUS") == "OPEN",
+        high,
+        high & (pl.col("DEFECT COUNTERMEASURES") != ""),
+        soc,
+        soc & closed,
+    ]
+    return [flag.fill_null(False).alias(name) for flag, name in zip(flags, DH_COUNTERS)]
 
-    dh_found_high = df.filter(pl.col("PRIORITY") == "HIGH")
-    data_dh_found["HIGH"] = int(dh_found_high.height)
 
-    # DH OPEN
-    dh_open_found = (
-        df.filter(pl.col("STATUS") == "OPEN")
+def get_data_dh_counts(df: pl.DataFrame | pl.LazyFrame) -> pl.LazyFrame:
+    """Build the single-scan plan computing `DH_COUNTERS` per work center."""
+    return (
+        df.lazy()
+        .select("WORK CENTER TYPE", *dh_counter_flags())
         .group_by("WORK CENTER TYPE")
-        .agg(pl.count().alias("COUNT"))
-        .with_columns(pl.col("WORK CENTER TYPE").alias("WORK CENTER"))
-        .select(["WORK CENTER", "COUNT"])
+        .agg(pl.col(DH_COUNTERS).sum())
+        .sort("WORK CENTER TYPE", nulls_last=True)
     )
-    data_dh_open = {
-        "DH OPEN": int(dh_open_found["COUNT"].sum()) if dh_open_found.height > 0 else 0
-    }
+
+
+def dh_metrics_from_counts(counts: pl.DataFrame) -> dict:
+    """Turn per-work-center counters into the report's metric sections."""
+    totals = {name: int(counts[name].sum()) for name in DH_COUNTERS}
+    rows = counts.to_dicts()
+
+    data_dh_component = {"FOUND": totals["COMPONENT FOUND"]}
+    for row in rows:
+        if row["COMPONENT FOUND"] > 0:
+            data_dh_component[f"  - {row['WORK CENTER TYPE']}"] = row["COMPONENT FOUND"]
+    data_dh_component["FIX"] = totals["COMPONENT FIX"]
+
+    data_dh_found = {"FOUND": totals["FOUND"]}
+    for row in rows:
+        data_dh_found[f"  - {row['WORK CENTER TYPE']}"] = row["FOUND"]
+    data_dh_found["HIGH"] = totals["HIGH"]
 
     # percent of HIGH with countermeasures
-    total_dh_high = int(dh_found_high.height)
-    dh_high_with_cm = int(
-        dh_found_high.filter(pl.col("DEFECT COUNTERMEASURES") != "").height
-    )
-    data_dh_open["% HIGH CM"] = 100 * (
-        dh_high_with_cm / total_dh_high if total_dh_high != 0 else 0
-    )
+    data_dh_open = {
+        "DH OPEN": totals["OPEN"],
+        "% HIGH CM": 100
+        * (totals["HIGH CM"] / totals["HIGH"] if totals["HIGH"] != 0 else 0),
+    }
 
-    # filter dataframe for column "DEFECT TYPES" containing "SOURCE_OF_CONTAMINATION"
-    dh_soc_found = df.filter(
-        pl.col("DEFECT TYPES").str.contains("SOURCE_OF_CONTAMINATION")
-    )
-    data_dh_soc = {}
-    data_dh_soc["FOUND"] = int(dh_soc_found.height) if dh_soc_found.height > 0 else 0
-    data_dh_soc["FIX"] = (
-        int(dh_soc_found.filter(pl.col("STATUS") == "CLOSED").height)
-        if dh_soc_found.height > 0
-        else 0
-    )
+    data_dh_soc = {"FOUND": totals["SOC FOUND"], "FIX": totals["SOC FIX"]}
 
-    all_data = {
+    return {
         "DH COMPONENT": data_dh_component,
         "DH FOUND": data_dh_found,
         "DH OPEN": data_dh_open,
         "DH SOC": data_dh_soc,
     }
-    return all_data
 
 
-def get_data_dh_detail_open(df: pl.DataFrame):
-    # Filter DH column 'STATUS' = 'OPEN'
-    dh_open_df = df.filter(df["STATUS"] == "OPEN")
-
-    dh_detail = {}
-
-    # Get values in column 'DESCRIPTION' for all DH OPEN
-    dh_open_details = []
-    # Extract required columns once and loop over native Python dicts
-    for row in dh_open_df.select(
-        ["NUMBER", "WORK CENTER TYPE", "DESCRIPTION"]
-    ).to_dicts():
-        num = row.get("NUMBER")
-        wct = str(row.get("WORK CENTER TYPE", "")).split()
-        wc_type = (wct[0][0] if wct and len(wct[0]) > 0 else "") + (
-            wct[1] if len(wct) > 1 else ""
-        )
-        description = row.get("DESCRIPTION")
-        dh_open_details.append(f"{num} | {wc_type} | {description}")
+def get_data_dh_metrics(df: pl.DataFrame):
+    # Every section comes from one group_by scan with conditional counts
+    return dh_metrics_from_counts(get_data_dh_counts(df).collect())
 
-    dh_detail["DH OPEN"] = dh_open_details
 
-    return dh_detail
+# Trend periods offered by the DH tab and their `group_by_dynamic` windows
+DH_TREND_PERIODS = {"Weekly": "1w", "Monthly": "1mo"}
 
+DH_TREND_COUNTERS = ["FOUND", "CIL FOUND", "CLOSED", "SOC", "HIGH"]
 
-def get_data_dh_detail_high(df: pl.DataFrame):
-    # Filter DH column 'PRIORITY' = 'HIGH'
-    dh_high_df = df.filter(pl.col("PRIORITY") == "HIGH")
 
-    dh_detail = {}
+def get_dh_trend_rollups(df: pl.DataFrame) -> dict[str, pl.DataFrame]:
+    """Roll DH records up per work center into `DH_TREND_PERIODS` buckets.
 
-    # Get values in column 'DESCRIPTION' for all DH HIGH
-    dh_high_details = []
-    for row in dh_high_df.select(
-        [
-            "NUMBER",
+    Returns one small frame per period with a `PERIOD` start date, the work
+    center and the `DH_TREND_COUNTERS`. All periods are computed together so
+    the raw defects are scanned once per load; switching the trend view then
+    only reads the rollup. Records without `REPORTED AT` are skipped.
+    """
+    flags = [
+        pl.lit(True),
+        pl.col("FOUND DURING") == "CIL",
+        pl.col("STATUS") == "CLOSED",
+        pl.col("DEFECT TYPES").str.contains("SOURCE_OF_CONTAMINATION"),
+        pl.col("PRIORITY") == "HIGH",
+    ]
+    base = (
+        df.lazy()
+        .filter(pl.col("REPORTED AT").is_not_null())
+        .select(
+            pl.col("REPORTED AT"),
+            pl.col("WORK CENTER TYPE").cast(pl.String),
+            *(
+                flag.fill_null(False).alias(name)
+                for flag, name in zip(flags, DH_TREND_COUNTERS)
+            ),
+        )
+        .sort("WORK CENTER TYPE", "REPORTED AT")
+    )
+
+    plans = [
+        base.group_by_dynamic(
+            "REPORTED AT",
+            every=every,
+            group_by="WORK CENTER TYPE",
+            start_by="monday" if every == "1w" else "window",
+        )
+        .agg(pl.col(DH_TREND_COUNTERS).sum())
+        .select(
+            pl.col("REPORTED AT").dt.date().alias("PERIOD"),
             "WORK CENTER TYPE",
-            "DESCRIPTION",
-            "STATUS",
-            "DEFECT COUNTERMEASURES",
-        ]
-    ).to_dicts():
-        num = row.get("NUMBER")
-        wct = str(row.get("WORK CENTER TYPE", "")).split()
-        wc_type = (wct[0][0] if wct and len(wct[0]) > 0 else "") + (
-            wct[1] if len(wct) > 1 else ""
+            *DH_TREND_COUNTERS,
         )
-        description = row.get("DESCRIPTION")
-        detail = f"{num} | {wc_type} | {description}"
-        status = row.get("STATUS")
-        countermeasures = row.get("DEFECT COUNTERMEASURES")
-        dh_high_details.append([detail, status, countermeasures])
+        .sort("PERIOD", "WORK CENTER TYPE")
+        for every in DH_TREND_PERIODS.values()
+    ]
+    return dict(zip(DH_TREND_PERIODS, pl.collect_all(plans)))
 
-    dh_detail["DH HIGH"] = dh_high_details
 
-    return dh_detail
+def _as_text(col: str) -> pl.Expr:
+    # Mirror f-string formatting of missing values ("None")
+    return pl.col(col).cast(pl.String).fill_null("None")
 
 
-def create_dh_report_text(df: pl.DataFrame) -> str:
-    # Determine date range for the report (YYYY-MM-DD)
-    reported_vals = df.filter(pl.col("REPORTED AT").is_not_null())[
-        "REPORTED AT"
-    ].to_list()
-
-    def _parse_date_token(tok: str):
-        if not tok:
-            return None
-        # try iso first (fast for YYYY-MM-DD)
-        try:
-            return datetime.fromisoformat(tok).date()
-        except Exception:
-            pass
-        # try a handful of common formats
-        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y", "%Y/%m/%d", "%d/%m/%Y"):
-            try:
-                return datetime.strptime(tok, fmt).date()
-            except Exception:
-                continue
+def dh_detail_expr() -> pl.Expr:
+    """Expression building the "NUMBER | M21 | DESCRIPTION" detail line.
+
+    The work center is abbreviated to the first letter of its first word plus
+    its second word, e.g. "Maker 21" -> "M21".
+    """
+    # Collapse whitespace runs first so this splits like Python's str.split()
+    wct = (
+        _as_text("WORK CENTER TYPE")
+        .str.replace_all(r"\s+", " ")
+        .str.strip_chars()
+        .str.split(" ")
+    )
+    wc_type = pl.concat_str(
+        wct.list.get(0, null_on_oob=True).str.slice(0, 1).fill_null(""),
+        wct.list.get(1, null_on_oob=True).fill_null(""),
+    )
+    return pl.concat_str(
+        _as_text("NUMBER"), wc_type, _as_text("DESCRIPTION"), separator=" | "
+    )
+
+
+def get_data_dh_detail_open(df: pl.DataFrame):
+    # Detail line for every DH with column 'STATUS' = 'OPEN'
+    dh_open_details = (
+        df.lazy()
+        .filter(pl.col("STATUS") == "OPEN")
+        .select(dh_detail_expr().alias("DH OPEN"))
+        .collect()
+        .to_series()
+    )
+
+    return {"DH OPEN": dh_open_details}
+
+
+def get_data_dh_detail_high(df: pl.DataFrame):
+    # Detail entry (line, status, countermeasures) for DH with 'PRIORITY' = 'HIGH'
+    dh_high_details = (
+        df.lazy()
+        .filter(pl.col("PRIORITY") == "HIGH")
+        .select(
+            pl.concat_str(
+                dh_detail_expr(),
+                pl.lit(" \n- Status: "),
+                _as_text("STATUS"),
+                pl.lit(" \n- Countermeasures: "),
+                _as_text("DEFECT COUNTERMEASURES"),
+            ).alias("DH HIGH")
+        )
+        .collect()
+        .to_series()
+    )
+
+    return {"DH HIGH": dh_high_details}
+
+
+def _quote_lines(lines: pl.Series) -> str:
+    """Join detail entries into "> entry" report lines in one native call."""
+    if lines.is_empty():
+        return ""
+    return "> " + lines.str.join("\n> ").item() + "\n"
+
+
+def get_dh_report_period(df: pl.DataFrame) -> tuple[date, date] | None:
+    """Return the first and last `REPORTED AT` day, or None when unknown.
+
+    Frames from `read_data_dh` already hold a parsed Datetime column, so
+    this is a single min/max aggregation. Raw text columns are normalized
+    with the same formats used at load time.
+    """
+    reported = pl.col("REPORTED AT")
+    if df.schema["REPORTED AT"] == pl.String:
+        reported = parse_datetime_formats(reported, REPORTED_AT_FORMATS)
+    reported = reported.dt.date()
+
+    date_min, date_max = df.select(
+        reported.min().alias("min"), reported.max().alias("max")
+    ).row(0)
+    if date_min is None:
         return None
+    return date_min, date_max
 
-    dates = []
-    for v in reported_vals:
-        if v is None:
-            continue
-        # handle already-parsed dates or datetimes
-        if hasattr(v, "date") and not isinstance(v, str):
-            try:
-                dates.append(v.date() if hasattr(v, "date") else v)
-                continue
-            except Exception:
-                pass
-        tok = str(v).strip().split(" ")[0]
-        parsed = _parse_date_token(tok)
-        if parsed:
-            dates.append(parsed)
-
-    if dates:
-        date_min = min(dates).isoformat()
-        date_max = max(dates).isoformat()
+
+def create_dh_report_text(df: pl.DataFrame) -> str:
+    # Determine date range for the report (YYYY-MM-DD)
+    date_range = get_dh_report_period(df)
+    if date_range is not None:
+        date_min, date_max = (d.isoformat() for d in date_range)
         period = f"DH Report for {date_min} to {date_max}"
     else:
         period = "DH Report"
@@ -235,22 +431,14 @@ def create_dh_report_text(df: pl.DataFrame) -> str:
 
     # Details: open and high
     data_dh_detail_open = get_data_dh_detail_open(df)
-    dh_open_report = "*DH OPEN Details:*\n"
-    for detail in data_dh_detail_open.get("DH OPEN", []):
-        dh_open_report += f"> {detail}\n"
+    dh_open_report = "*DH OPEN Details:*\n" + _quote_lines(
+        data_dh_detail_open["DH OPEN"]
+    )
 
     data_dh_detail_high = get_data_dh_detail_high(df)
-    dh_high_report = "*DH HIGH Details:*\n"
-    for item in data_dh_detail_high.get("DH HIGH", []):
-        # item is [detail, status, countermeasures]
-        if not item:
-            continue
-        detail = item[0]
-        status = item[1] if len(item) > 1 else ""
-        countermeasures = item[2] if len(item) > 2 else ""
-        dh_high_report += (
-            f"> {detail} \n- Status: {status} \n- Countermeasures: {countermeasures}\n"
-        )
+    dh_high_report = "*DH HIGH Details:*\n" + _quote_lines(
+        data_dh_detail_high["DH HIGH"]
+    )
 
     full_report = f"{period}\n\n{tabulate_report}{dh_open_report}\n{dh_high_report}"
     return full_report
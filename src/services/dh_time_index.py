@@ -0,0 +1,73 @@
+"""Binary-searched date-range access to DH records."""
+
+from __future__ import annotations
+
+import datetime
+
+import polars as pl
+
+from .dh_data_service import sort_dh_by_reported_at
+
+# Shift windows as (start hour, end hour) on the REPORTED AT clock.
+# Shift 3 runs past midnight into the next day.
+SHIFT_HOURS = {1: (6, 14), 2: (14, 22), 3: (22, 6)}
+
+
+def _as_datetime(value: datetime.date | datetime.datetime) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.combine(value, datetime.time())
+
+
+class DHTimeIndex:
+    """Slice a DH frame by `REPORTED AT` in O(log n) without copying.
+
+    The frame is kept newest first (see `sort_dh_by_reported_at`; frames from
+    `read_data_dh` already are), so every window is one contiguous block found
+    with two `search_sorted` calls and returned as a zero-copy `slice`.
+    Records without `REPORTED AT` sort last and never match a window.
+    """
+
+    def __init__(self, df: pl.DataFrame) -> None:
+        reported = df["REPORTED AT"]
+        if not reported.flags["SORTED_DESC"]:
+            # Frames read back from the IPC cache lose the sorted flag; verify
+            # the order (linear, no copy) before falling back to a sort.
+            if reported.is_sorted(descending=True, nulls_last=True):
+                reported = reported.set_sorted(descending=True)
+            else:
+                df = sort_dh_by_reported_at(df)
+                reported = df["REPORTED AT"]
+        self.df = df
+        self._times = reported.slice(0, reported.len() - reported.null_count())
+
+    def between(
+        self,
+        start: datetime.date | datetime.datetime,
+        end: datetime.date | datetime.datetime,
+    ) -> pl.DataFrame:
+        """Return records reported in ``[start, end)``."""
+        # Newest first: rows before `lo` are >= end, rows from `hi` are < start
+        lo = self._times.search_sorted(_as_datetime(end), "right", descending=True)
+        hi = self._times.search_sorted(_as_datetime(start), "right", descending=True)
+        return self.df.slice(lo, max(hi - lo, 0))
+
+    def week(self, year: int, week: int) -> pl.DataFrame:
+        """Return records of an ISO week (Monday to Sunday)."""
+        start = datetime.date.fromisocalendar(year, week, 1)
+        return self.between(start, start + datetime.timedelta(days=7))
+
+    def month(self, year: int, month: int) -> pl.DataFrame:
+        """Return records of a calendar month."""
+        start = datetime.date(year, month, 1)
+        end = datetime.date(year + month // 12, month % 12 + 1, 1)
+        return self.between(start, end)
+
+    def shift(self, day: datetime.date, shift: int) -> pl.DataFrame:
+        """Return records of a shift (see `SHIFT_HOURS`) that starts on `day`."""
+        start_hour, end_hour = SHIFT_HOURS[shift]
+        start = _as_datetime(day) + datetime.timedelta(hours=start_hour)
+        end = _as_datetime(day) + datetime.timedelta(hours=end_hour)
+        if end <= start:
+            end += datetime.timedelta(days=1)
+        return self.between(start, end)
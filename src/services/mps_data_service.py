@@ -1,8 +1,32 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import polars as pl
-from ..utils.helpers import safe_read_excel
+from ..utils.frame_cache import FrameCache, FrameLRU
+from ..utils.helpers import parse_date_formats, parse_iso_date, safe_read_excel
+from ..utils.rnm_ui_helpers import make_qr_image
 import datetime
 from typing import Any, Iterable, List, Optional
 
+# Bump whenever `read_data_mps` changes the frame it returns so cached
+# entries written by an older version are ignored.
+MPS_SCHEMA_VERSION = 2
+
+# DATE formats `parse_date_value` tries, in order, after ISO dates
+MPS_DATE_FORMATS = (
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%m-%d-%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+# Parsed MPS workbooks for this session, keyed by (path, size, mtime, sheet)
+_MPS_FRAMES = FrameLRU(maxsize=8)
+
 
 def parse_date_value(v: Any) -> Optional[datetime.date]:
     """Normalize a single value to a python.date or return None.
@@ -33,15 +57,7 @@ def parse_date_value(v: Any) -> Optional[datetime.date]:
             pass
 
         # Try a few common formats seen in Excel/CSV exports
-        for fmt in (
-            "%d/%m/%Y",
-            "%d-%m-%Y",
-            "%Y/%m/%d",
-            "%m/%d/%Y",
-            "%m-%d-%Y",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-        ):
+        for fmt in MPS_DATE_FORMATS:
             try:
                 return datetime.datetime.strptime(s, fmt).date()
             except Exception:
@@ -62,168 +78,225 @@ def convert_date_values(vals: Iterable[Any]) -> List[Optional[datetime.date]]:
     return [parse_date_value(v) for v in vals]
 
 
+def normalize_date_column(values: pl.Series) -> pl.Series:
+    """Vectorized `convert_date_values`: return `values` as a `pl.Date` Series.
+
+    Date columns are returned as-is and Datetime columns keep their date
+    part; anything else is parsed as text like `parse_date_value` does:
+    stripped, then `date.fromisoformat` forms (`parse_iso_date`), then
+    `MPS_DATE_FORMATS` with strptime's rules. Unparseable values become null.
+    """
+    if values.dtype == pl.Date:
+        return values
+    if values.dtype == pl.Datetime:
+        return values.dt.date()
+    text = values.cast(pl.String)
+    stripped = pl.col(text.name).str.strip_chars()
+    return text.to_frame().select(
+        pl.coalesce(
+            parse_iso_date(stripped), parse_date_formats(stripped, MPS_DATE_FORMATS)
+        )
+    )[text.name]
+
+
+# Report columns `read_data_mps` keeps
+MPS_COLUMNS = ["DATE", "Shift", "Owner", "Equipment", "Activity Description"]
+
+# Plan/actual bookkeeping columns, kept typed next to `MPS_COLUMNS`
+MPS_METRIC_COLUMNS = {
+    "Plan exe (min)": pl.Float64,
+    "Actual (min)": pl.Float64,
+    "Year": pl.Int32,
+    "No. DH": pl.Int32,
+}
+
+
+def _header_names(row: tuple) -> list[str]:
+    # Header cells as column names; blanks and repeats get a unique suffix
+    seen: dict[str, int] = {}
+    names = []
+    for value in row:
+        name = "" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            names.append(f"{name}_{seen[name]}")
+        else:
+            seen[name] = 1
+            names.append(name)
+    return names
+
+
 def read_excel_with_dynamic_header(
     excel_path: str,
     sheet: str = "Tracking",
     header_token: str = "DATE",
     fallback_header_row: int = 0,
+    columns: list[str] | None = None,
+    optional_columns: list[str] | None = None,
 ) -> pl.DataFrame:
-    """Read an Excel sheet and detect a header row dynamically.
+    """Read an Excel sheet whose header row is preceded by title rows.
 
-    Behavior mirrors the previous script: read the full sheet into a DataFrame,
-    try to locate a row where the first column equals `header_token` and use
-    that row for column names (data starts on the next row). If the token
-    is already present in the DataFrame columns, the DataFrame is returned
-    unchanged.
+    The sheet is read once, without a header and as text, so the title rows
+    cannot skew type inference. The first row whose first cell is
+    `header_token` (case-insensitive) names the columns and the rows below
+    it are the data.
 
     Args:
         excel_path: path to the excel file
         sheet: sheet name to read
-        header_token: token to look for in the first column to detect header
-        full_csv_path: optional path to write the full raw frame (for debugging)
-        output_csv_path: optional path to write the resulting parsed frame
-        fallback_header_row: index to use if header row isn't found
-        write_debug_csvs: whether to write the CSV debug files
+        header_token: first-column text that identifies the header row
+        fallback_header_row: header row to use if the token isn't found
+        columns: header names to keep (None keeps every column)
+        optional_columns: extra header names kept when the sheet has them
 
     Returns:
-        pl.DataFrame: properly labeled dataframe (data rows only)
+        pl.DataFrame: properly labeled dataframe (data rows only, as text)
     """
-
-    # Use full inference so polars doesn't incorrectly fall back to string dtype
-    # because of mixed content within the first N rows.
-    full_df = safe_read_excel(excel_path, sheet_name=sheet, infer_schema_length=None)
-
-    # If token already in columns (case-insensitive), no reheader needed
-    cols_up = [str(c).upper() for c in full_df.columns]
-    if header_token.upper() in cols_up:
-        return full_df
-
-    # locate header row where the first column equals the header_token
-    header_row_idx = None
-    for i in range(full_df.height):
-        try:
-            first_val = full_df[i, 0]
-        except Exception:
-            # fallback to row method
-            row = full_df.row(i)
-            first_val = row[0] if row else None
-
-        if isinstance(first_val, str) and first_val.upper() == header_token.upper():
-            header_row_idx = i
-            break
-
-    if header_row_idx is None:
-        header_row_idx = fallback_header_row
-
-    # build normalized header list from that row
-    raw_header = list(full_df.row(header_row_idx))
-    seen: dict[str, int] = {}
-    header: list[str] = []
-    for h in raw_header:
-        if h is None:
-            h = ""
-        elif isinstance(h, (bytes, bytearray)):
-            try:
-                h = h.decode()
-            except Exception:
-                h = str(h)
-        elif isinstance(h, (pl.Series,)):
-            h = str(h)
-        elif hasattr(h, "isoformat") and not isinstance(h, str):
-            try:
-                h = h.isoformat()
-            except Exception:
-                h = str(h)
-        else:
-            h = str(h)
-
-        if h in seen:
-            seen[h] += 1
-            header.append(f"{h}_{seen[h]}")
-        else:
-            seen[h] = 1
-            header.append(h)
-
-    df = full_df.slice(header_row_idx + 1)
-    df.columns = header
-
-    return df
+    raw = safe_read_excel(
+        excel_path, sheet_name=sheet, has_header=False, infer_schema_length=0
+    )
+    first = raw.to_series(0).cast(pl.String).str.to_uppercase()
+    hits = (first == header_token.upper()).arg_true()
+    header_row = hits[0] if len(hits) else fallback_header_row
+
+    df = raw.slice(header_row + 1)
+    df.columns = _header_names(raw.row(header_row))
+    if columns is None:
+        return df
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in sheet '{sheet}'")
+    extra = [c for c in optional_columns or () if c in df.columns and c not in columns]
+    return df.select(*columns, *extra)
+
+
+def mps_owner_expr() -> pl.Expr:
+    """Owner without its shift suffix ("technician shift 1" -> "Technician")."""
+    owner = (
+        pl.col("Owner")
+        .cast(pl.String)
+        .str.replace(r"(?s)(?:shift|Shift).*", "")
+        .str.strip_chars()
+    )
+    return (
+        owner.str.slice(0, 1).str.to_uppercase() + owner.str.slice(1).str.to_lowercase()
+    ).alias("Owner")
+
+
+def mps_equipment_expr() -> pl.Expr:
+    """Equipment name without its numbering ("08. Focke 751" -> "Focke 751")."""
+    equipment = pl.col("Equipment").cast(pl.String)
+    return (
+        pl.when(equipment.str.contains(".", literal=True))
+        .then(equipment.str.split(".").list.get(1, null_on_oob=True))
+        .otherwise(equipment)
+        .str.strip_chars()
+        .alias("Equipment")
+    )
 
 
 def read_data_mps(
     path: str | None = None, sheet_name: str | None = None
 ) -> "pl.DataFrame":
-    # Read the entire sheet
-    df: pl.DataFrame = read_excel_with_dynamic_header(path, sheet=sheet_name)
+    # Keep only the report and metric columns (as text, like the sheet's
+    # free-form cells); metric columns are optional
+    df: pl.DataFrame = read_excel_with_dynamic_header(
+        path,
+        sheet=sheet_name,
+        columns=MPS_COLUMNS,
+        optional_columns=list(MPS_METRIC_COLUMNS),
+    )
 
     # remove rows where DATE column is null
     df = df.filter(pl.col("DATE").is_not_null())
 
-    # Clean Owner column similar to the original logic (avoid Expr.apply)
-    if "Owner" in df.columns:
-        owner_vals = df["Owner"].to_list()
-
-        def _clean_owner(s):
-            if s is None:
-                return s
-            try:
-                st = str(s)
-            except Exception:
-                return s
-            return st.split("shift")[0].split("Shift")[0].strip().capitalize()
-
-        owners_clean = [_clean_owner(v) for v in owner_vals]
-        df = df.with_columns(pl.Series("Owner", owners_clean))
-
-    # Select only relevant columns
-    df = df.select(["DATE", "Shift", "Owner", "Equipment", "Activity Description"])
+    # Select only relevant columns and tidy the free-text ones
+    df = df.with_columns(
+        pl.lit(None, pl.String).alias(c) for c in MPS_METRIC_COLUMNS if c not in df
+    )
+    df = df.select(*MPS_COLUMNS, *MPS_METRIC_COLUMNS).with_columns(
+        mps_owner_expr(),
+        mps_equipment_expr(),
+        pl.col("Shift").cast(pl.Int32),
+        # Plan/actual minutes, year and DH number are sometimes empty or
+        # mixed with text; anything non-numeric becomes null
+        *(
+            pl.col(c)
+            .str.strip_chars()
+            .cast(pl.Float64, strict=False)
+            .cast(dtype, strict=False)
+            for c, dtype in MPS_METRIC_COLUMNS.items()
+        ),
+    )
 
     # Convert DATE column to date format (YYYY-MM-DD)
-    # The sheet may contain python dates, datetimes or strings — normalize them to python.date.
-    date_vals = df["DATE"].to_list()
-
-    # Use the exported convenience helper to convert the column values
-    converted = convert_date_values(date_vals)
-    df = df.with_columns(pl.Series("DATE", converted))
-
-    # Convert Shift column to int (if present)
-    if "Shift" in df.columns:
-        df = df.with_columns(pl.col("Shift").cast(pl.Int32).alias("Shift"))
-
-    # Cast numeric runtime/plan columns to float for consistent downstream handling
-    for num_col in ("Plan exe (min)", "Actual (min)"):
-        if num_col in df.columns:
-            # cast conservatively to Float64 to preserve decimals where present
-            df = df.with_columns(pl.col(num_col).cast(pl.Float64).alias(num_col))
-
-    # Cast obvious ints
-    if "Year" in df.columns:
-        df = df.with_columns(pl.col("Year").cast(pl.Int32).alias("Year"))
-    if "No. DH" in df.columns:
-        # sometimes this is empty or mixed; cast non-destructively
-        df = df.with_columns(pl.col("No. DH").cast(pl.Int32).alias("No. DH"))
+    # The sheet may contain dates, datetimes or strings — normalize them to pl.Date.
+    df = df.with_columns(normalize_date_column(df["DATE"]))
 
     # Sort by DATE column, and then by Shift if needed
     df = df.sort(by=["DATE", "Shift"], nulls_last=True, descending=False)
 
-    # split Equipment column to get the part after the dot and trim spaces
-    if "Equipment" in df.columns:
-        equipment_vals = df["Equipment"].to_list()
+    return df.clone()
 
-        def _clean_equipment(s):
-            if s is None:
-                return s
-            s_str = str(s)
-            if "." in s_str:
-                parts = s_str.split(".")
-                # return part after first dot
-                return parts[1].strip()
-            return s_str.strip()
 
-        equipments_clean = [_clean_equipment(v) for v in equipment_vals]
-        df = df.with_columns(pl.Series("Equipment", equipments_clean))
+def get_mps_adherence(df: "pl.DataFrame") -> "pl.DataFrame":
+    """Plan-vs-actual minutes per ISO week, owner and equipment.
 
-    return df.clone()
+    `Adherence` is actual / plan over the activities that have both values
+    (null when none do) and `Overrun (min)` sums the minutes by which those
+    activities ran past their plan. Computed in one lazy aggregation.
+    """
+    plan, actual = pl.col("Plan exe (min)"), pl.col("Actual (min)")
+    measured = plan.is_not_null() & actual.is_not_null()
+    planned_min = plan.filter(measured).sum()
+    return (
+        df.lazy()
+        .with_columns(
+            pl.lit(None, dtype).alias(c)
+            for c, dtype in MPS_METRIC_COLUMNS.items()
+            if c not in df.columns
+        )
+        .filter(pl.col("DATE").is_not_null())
+        .group_by(
+            pl.col("DATE").dt.iso_year().alias("ISO YEAR"),
+            pl.col("DATE").dt.week().alias("WEEK"),
+            "Owner",
+            "Equipment",
+        )
+        .agg(
+            pl.len().alias("Activities"),
+            plan.sum().alias("Plan (min)"),
+            actual.sum().alias("Actual (min)"),
+            pl.when(planned_min > 0)
+            .then(actual.filter(measured).sum() / planned_min)
+            .alias("Adherence"),
+            (actual - plan).filter(measured).clip(0).sum().alias("Overrun (min)"),
+        )
+        .sort(["ISO YEAR", "WEEK", "Owner", "Equipment"], nulls_last=True)
+        .collect()
+    )
+
+
+def read_data_mps_cached(
+    path: str, sheet_name: str | None = None, cache: FrameCache | None = None
+) -> "pl.DataFrame":
+    """Return `read_data_mps(path, sheet_name)`, parsing the workbook only once.
+
+    Parsed frames are kept in memory keyed by the workbook's path, size,
+    mtime and sheet, so repeated "Get Data" clicks on an unchanged file
+    skip openpyxl/calamine entirely. When `cache` is given the frame is also
+    persisted there and survives restarts; a saved workbook gets a new
+    fingerprint and is re-read on the next call.
+    """
+
+    def _load(p: str) -> pl.DataFrame:
+        if cache is None:
+            return read_data_mps(p, sheet_name=sheet_name)
+        return cache.get_or_load(
+            p, lambda q: read_data_mps(q, sheet_name=sheet_name), sheet_name
+        )
+
+    return _MPS_FRAMES.get_or_load(path, _load, sheet_name)
 
 
 def filter_data_mps_by_year(df: "pl.DataFrame", year: int) -> "pl.DataFrame":
@@ -279,14 +352,27 @@ def filter_data_mps_by_date_and_shift(
     return df_filtered.clone()
 
 
-def create_report_text(df: "pl.DataFrame") -> str:
-    rows = df.to_dicts()
-    if not rows:
-        return ""
+def mps_report_body_expr() -> pl.Expr:
+    """One report block per activity, joined into a single String.
 
-    first = rows[0]
+    Expects frames from `read_data_mps`, whose Owner/Equipment are already
+    cleaned (see `mps_owner_expr` / `mps_equipment_expr`).
+    """
+    line = pl.concat_str(
+        pl.lit("*"),
+        pl.col("Owner").cast(pl.String).fill_null("None").str.strip_chars(),
+        pl.lit("*\n> "),
+        pl.col("Equipment").cast(pl.String).fill_null("").str.strip_chars(),
+        pl.lit("\n- "),
+        pl.col("Activity Description").cast(pl.String).fill_null(""),
+        pl.lit("\n\n"),
+    )
+    return line.str.join("").alias("body")
+
+
+def mps_report_header(date_val: Any, shift_val: Any) -> str:
+    """Return the first line of a shift report."""
     # Format date safely
-    date_val = first.get("DATE")
     try:
         # If it's a datetime-like object
         date_str = date_val.strftime("%Y-%m-%d")
@@ -294,8 +380,6 @@ def create_report_text(df: "pl.DataFrame") -> str:
         date_str = str(date_val).split(" ")[0]
 
     # Handle shift which may be float, int, or missing
-    shift_val = first.get("Shift", "")
-    shift_text = ""
     try:
         if shift_val is None:
             shift_text = ""
@@ -309,17 +393,60 @@ def create_report_text(df: "pl.DataFrame") -> str:
     except Exception:
         shift_text = str(shift_val)
 
-    report_header = f"📅 *MPS {date_str}, Shift {shift_text}*\n"
+    return f"📅 *MPS {date_str}, Shift {shift_text}*\n"
 
-    for row in rows:
-        owner = str(row.get("Owner", "")).strip().capitalize()
-        equipment = row.get("Equipment", "")
-        equipment_s = "" if equipment is None else str(equipment)
-        equipment_name = (
-            equipment_s.split(".")[1].strip()
-            if "." in equipment_s
-            else equipment_s.strip()
-        )
-        activity = row.get("Activity Description", "") or ""
-        report_header += f"*{owner}*\n" f"> {equipment_name}\n" f"- {activity}\n\n"
-    return report_header
+
+def create_report_text(df: "pl.DataFrame") -> str:
+    if df.is_empty():
+        return ""
+    header = mps_report_header(df["DATE"][0], df["Shift"][0])
+    return header + df.select(mps_report_body_expr()).item()
+
+
+def create_week_reports(df: "pl.DataFrame") -> dict[tuple[datetime.date, int], str]:
+    """Render the report of every (date, shift) in `df`, e.g. one ISO week.
+
+    All bodies are built in one `group_by` aggregation; rows without a date
+    or shift are skipped since they cannot be selected in the sidebar. Keys
+    are ``(date, shift)`` in chronological order.
+    """
+    keyed = df.filter(pl.col("DATE").is_not_null() & pl.col("Shift").is_not_null())
+    bodies = (
+        keyed.group_by(["DATE", "Shift"], maintain_order=True)
+        .agg(mps_report_body_expr())
+        .sort(["DATE", "Shift"])
+    )
+    return {
+        (day, shift): mps_report_header(day, shift) + body
+        for day, shift, body in bodies.iter_rows()
+    }
+
+
+def export_reports(
+    reports: dict[tuple[datetime.date, int], str],
+    folder: str | os.PathLike,
+    qr: bool = True,
+    max_workers: int | None = None,
+) -> list[Path]:
+    """Write each report to ``MPS_<date>_Shift<n>.txt`` (+ ``.png`` QR code).
+
+    QR images are rendered and saved by a pool of worker threads. Returns the
+    written paths.
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    def _write(item: tuple[tuple[datetime.date, int], str]) -> list[Path]:
+        (day, shift), text = item
+        stem = folder / f"MPS_{day:%Y-%m-%d}_Shift{shift}"
+        txt = stem.with_suffix(".txt")
+        txt.write_text(text, encoding="utf-8")
+        if not qr:
+            return [txt]
+        png = stem.with_suffix(".png")
+        make_qr_image(text).save(png)
+        return [txt, png]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        written = pool.map(_write, reports.items())
+        return [path for paths in written for path in paths]
@@ -0,0 +1,68 @@
+"""Dictionary lookups for the MPS week table and shift reports."""
+
+from __future__ import annotations
+
+import datetime
+
+import polars as pl
+
+from .mps_data_service import get_mps_adherence, parse_date_value
+
+
+class MPSIndex:
+    """Partition an MPS frame once so week/shift lookups are dict hits.
+
+    The frame is sorted by `DATE, Shift` a single time and split with
+    `partition_by(as_dict=True)` into one block per ISO week and one per
+    (date, shift). Lookups return those blocks as-is: no filter, sort or
+    clone per click. Weeks follow the ISO calendar like the sidebar, so the
+    last days of December can belong to week 1 of the next year.
+
+    Plan-vs-actual adherence (`get_mps_adherence`) is computed at the same
+    time and split per week as well.
+    """
+
+    def __init__(self, df: pl.DataFrame) -> None:
+        df = df.sort(["DATE", "Shift"], nulls_last=True, maintain_order=True)
+        self.df = df
+        self._empty = df.clear()
+        keyed = df.with_columns(
+            pl.col("DATE").dt.iso_year().alias("_iso_year"),
+            pl.col("DATE").dt.week().alias("_iso_week"),
+        )
+        self._weeks: dict[tuple, pl.DataFrame] = keyed.partition_by(
+            ["_iso_year", "_iso_week"],
+            as_dict=True,
+            include_key=False,
+            maintain_order=True,
+        )
+        self._shifts: dict[tuple, pl.DataFrame] = df.partition_by(
+            ["DATE", "Shift"], as_dict=True, maintain_order=True
+        )
+        adherence = get_mps_adherence(df)
+        self._adherence_empty = adherence.clear().drop("ISO YEAR", "WEEK")
+        self._adherence: dict[tuple, pl.DataFrame] = adherence.partition_by(
+            ["ISO YEAR", "WEEK"], as_dict=True, include_key=False, maintain_order=True
+        )
+
+    def weeks(self) -> list[tuple[int, int]]:
+        """Return the (ISO year, ISO week) pairs that have activities."""
+        return sorted(key for key in self._weeks if None not in key)
+
+    def week(self, year: int, week: int) -> pl.DataFrame:
+        """Return activities of an ISO week, ordered by date and shift."""
+        return self._weeks.get((year, week), self._empty)
+
+    def adherence(self, year: int, week: int) -> pl.DataFrame:
+        """Return plan-vs-actual per owner and equipment for an ISO week."""
+        return self._adherence.get((year, week), self._adherence_empty)
+
+    def date_and_shift(
+        self, target_date: datetime.date | str, target_shift: int
+    ) -> pl.DataFrame:
+        """Return activities planned for one shift of one day."""
+        if not isinstance(target_date, datetime.date):
+            target_date = parse_date_value(target_date)
+        elif isinstance(target_date, datetime.datetime):
+            target_date = target_date.date()
+        return self._shifts.get((target_date, target_shift), self._empty)
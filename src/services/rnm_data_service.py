@@ -1,52 +1,209 @@
+import asyncio
+import datetime
+
 import httpx
-from httpx_ntlm import HttpNtlmAuth
 import polars as pl
 
-from src.utils.spa_processor import scrape_data_spa
-
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36"
-}
+from src.services.spa_client import SPA_CLIENTS, SPAClientPool
+from src.utils.spa_cache import (
+    NetProductionDayCache,
+    SPAResponseCache,
+    spa_query_from_url,
+)
+from src.utils.spa_processor import (
+    find_net_production,
+    get_url_period_loss_tree,
+    is_empty_loss_tree,
+    is_loss_tree_result,
+    net_production_from_tables,
+    scrape_data_spa,
+)
 
 
 # fetch RNM data from given URL (html response) with NTLM auth
-async def fetch_rnm_data(url, username, password, verify_ssl=False):
-    # import here so a runtime without httpx/httpx_ntlm can still import this
-    # module (and use parse_rnm_tables for local HTML parsing, for example)
-
-    async with httpx.AsyncClient(
-        auth=HttpNtlmAuth(username, password), headers=HEADERS, verify=verify_ssl
-    ) as client:
-        response = await client.get(url)
-        if response.status_code == 200:
-            return response.text
-        else:
-            raise httpx.HTTPStatusError(
-                f"Failed to fetch data: {response.status_code}",
-                request=response.request,
-                response=response,
+async def fetch_rnm_data(
+    url, username, password, verify_ssl=False, pool: SPAClientPool | None = None
+):
+    """GET `url` with NTLM auth on a pooled keep-alive connection.
+
+    Uses the app-wide `SPA_CLIENTS` pool unless another `pool` is given.
+    """
+    pool = pool or SPA_CLIENTS
+    response = await pool.get(url, username, password, verify_ssl=verify_ssl)
+    if response.status_code == 200:
+        return response.text
+    else:
+        raise httpx.HTTPStatusError(
+            f"Failed to fetch data: {response.status_code}",
+            request=response.request,
+            response=response,
+        )
+
+
+async def fetch_spa_page(
+    url,
+    username,
+    password,
+    verify_ssl=False,
+    pool: SPAClientPool | None = None,
+    cache: SPAResponseCache | None = None,
+    refresh: bool = False,
+):
+    """Return the SPA page for `url`, from `cache` when it has a valid entry.
+
+    With `refresh` the cache is not read, but the fresh page still replaces
+    the stored one. URLs without loss-tree parameters are never cached, and
+    neither are pages without loss-tree results (`is_loss_tree_result`).
+    """
+    query = spa_query_from_url(url) if cache is not None else None
+    if query is not None and not refresh:
+        html = await asyncio.to_thread(cache.get, query)
+        if html is not None:
+            return html
+    html = await fetch_rnm_data(
+        url=url,
+        username=username,
+        password=password,
+        verify_ssl=verify_ssl,
+        pool=pool,
+    )
+    if query is not None and is_loss_tree_result(html):
+        await asyncio.to_thread(cache.put, query, html)
+    return html
+
+
+async def get_spa_net_production(
+    url,
+    username,
+    password,
+    verify_ssl=False,
+    pool: SPAClientPool | None = None,
+    cache: SPAResponseCache | None = None,
+    refresh: bool = False,
+    allow_empty: bool = False,
+):
+    """Fetch RTM SPA HTML via NTLM and return the net production in pieces.
+
+    The value is read straight from the "Time range" summary cell; the
+    loss-tree tables are only parsed (`scrape_data_spa`) if that cell
+    cannot be found. With `allow_empty`, a loss-tree report without results
+    for its period (`is_empty_loss_tree`) returns None; any other page
+    without net production raises ValueError. `cache`/`refresh` are passed
+    to `fetch_spa_page`.
+    """
+    response = await fetch_spa_page(
+        url, username, password, verify_ssl, pool=pool, cache=cache, refresh=refresh
+    )
+    net_product = find_net_production(response)
+    if net_product is None:
+        net_product = net_production_from_tables(scrape_data_spa(html=response))
+    if net_product is None:
+        if allow_empty and is_empty_loss_tree(response):
+            return None
+        raise ValueError("Net production not found in SPA response")
+    return net_product
+
+
+async def get_spa_net_production_for_days(
+    link_up: str,
+    date_min: datetime.date,
+    date_max: datetime.date,
+    username,
+    password,
+    verify_ssl=False,
+    shift: str = "",
+    functional_location: str = "PACK",
+    pool: SPAClientPool | None = None,
+    cache: NetProductionDayCache | None = None,
+    page_cache: SPAResponseCache | None = None,
+    refresh: bool = False,
+    max_concurrency: int = 4,
+    today: datetime.date | None = None,
+) -> float:
+    """Return the net production of `date_min`..`date_max` summed day by day.
+
+    Days after `today` (default: the current date) are not queried, and a
+    day whose loss-tree report is empty (no output that day) counts as 0;
+    that 0 is only cached as a live value, never as a final one.
+    Days found in `cache` are not fetched again. The missing ones are
+    queried as one-day SPA periods, at most `max_concurrency` at a time, and
+    stored before any failure is raised, so a retry only fetches what is
+    still missing. Day pages go through `page_cache` like any other SPA
+    page. With `refresh` every day is fetched again.
+    """
+    if date_max < date_min:
+        raise ValueError("date_max must not be before date_min")
+    date_max = min(date_max, today or datetime.date.today())
+    if date_max < date_min:
+        return 0.0
+    days = [
+        date_min + datetime.timedelta(days=i)
+        for i in range((date_max - date_min).days + 1)
+    ]
+    urls = {
+        day: get_url_period_loss_tree(
+            link_up, day.isoformat(), day.isoformat(), shift, functional_location
+        )
+        for day in days
+    }
+    query = spa_query_from_url(urls[date_min])
+    key = (query.line, query.functional_location, query.shift)
+
+    known = {}
+    if cache is not None and not refresh:
+        known = await asyncio.to_thread(cache.get_days, *key, days)
+    missing = [day for day in days if day not in known]
+
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_day(day):
+        async with limit:
+            return await get_spa_net_production(
+                urls[day],
+                username,
+                password,
+                verify_ssl,
+                pool=pool,
+                cache=page_cache,
+                refresh=refresh,
+                allow_empty=True,
             )
 
+    results = await asyncio.gather(
+        *(fetch_day(day) for day in missing), return_exceptions=True
+    )
+    fetched = {
+        day: value
+        for day, value in zip(missing, results)
+        if not isinstance(value, BaseException)
+    }
+    empty = [day for day, value in fetched.items() if value is None]
+    fetched.update(dict.fromkeys(empty, 0.0))
+    if cache is not None:
+        await asyncio.to_thread(cache.put_days, *key, fetched, empty)
+    for value in results:
+        if isinstance(value, BaseException):
+            raise value
+    return sum(known.values()) + sum(fetched.values())
+
 
-async def get_spa_net_production(url, username, password, verify_ssl=False):
+async def get_spa_loss_tree(
+    url,
+    username,
+    password,
+    verify_ssl=False,
+    pool: SPAClientPool | None = None,
+    cache: SPAResponseCache | None = None,
+    refresh: bool = False,
+):
     """Fetch RTM SPA HTML via NTLM then parse into cleaned DataFrames.
 
     Returns a list of polars DataFrames (same as scrape_data_spa).
     """
-    response = await fetch_rnm_data(
-        url=url, username=username, password=password, verify_ssl=verify_ssl
+    response = await fetch_spa_page(
+        url, username, password, verify_ssl, pool=pool, cache=cache, refresh=refresh
     )
-    dfs = scrape_data_spa(html=response)
-    for df in dfs:
-        if "Time range" in df.row(0):
-            net_product = float(str(df.row(5)[11]).split()[2])
-            unit = str(df.row(5)[11]).split()[3].strip(",")
-
-    if unit == "k":
-        net_product = float(net_product) * 1000
-    elif unit == "Mio":
-        net_product = float(net_product) * 1000000
-    return net_product
+    return scrape_data_spa(html=response)
 
 
 def read_sap_consumption_data(file_path: str):
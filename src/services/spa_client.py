@@ -0,0 +1,135 @@
+"""Long-lived NTLM HTTP clients for SPA/RTM fetches."""
+
+from __future__ import annotations
+
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+from httpx_ntlm import HttpNtlmAuth
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/111.0.0.0 Safari/537.36"
+}
+
+
+class SPAClientPool:
+    """Share keep-alive `httpx.AsyncClient`s between SPA fetches.
+
+    One client is kept per (username, verify_ssl) and per event loop, so
+    TCP/TLS setup and CA loading happen once. IIS binds NTLM to the
+    connection: a request on a pooled connection that already finished the
+    handshake is answered directly, without the 401/negotiate/authenticate
+    legs. At most `max_per_host` requests run against one host at a time
+    (`max_connections` in total), and idle connections are dropped after
+    `keepalive_expiry` seconds. A changed password replaces the client; the
+    old one is closed once the requests still running on it have finished.
+
+    Call `aclose` when the app exits.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 4,
+        max_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        # (username, verify_ssl) -> (client, password, event loop)
+        self._clients: dict[tuple, tuple[httpx.AsyncClient, str, object]] = {}
+        self._hosts: dict[tuple, asyncio.Semaphore] = {}
+        # Requests running per client, replaced clients waiting for theirs
+        # to finish, and close tasks kept alive until they are done
+        self._in_flight: dict[httpx.AsyncClient, int] = {}
+        self._retired: set[httpx.AsyncClient] = set()
+        self._closing: set[asyncio.Task] = set()
+
+    def client(
+        self, username: str, password: str, verify_ssl: bool = False
+    ) -> httpx.AsyncClient:
+        """Return the pooled client for these credentials, creating it once."""
+        loop = asyncio.get_running_loop()
+        key = (username, verify_ssl)
+        entry = self._clients.get(key)
+        if entry is not None:
+            client, client_password, client_loop = entry
+            if (
+                client_password == password
+                and client_loop is loop
+                and not client.is_closed
+            ):
+                return client
+            if client_loop is loop:
+                # Credentials changed: close once running requests finish
+                self._retire(client)
+        client = httpx.AsyncClient(
+            auth=HttpNtlmAuth(username, password),
+            headers=HEADERS,
+            verify=verify_ssl,
+            limits=self.limits,
+            timeout=self.timeout,
+        )
+        self._clients[key] = (client, password, loop)
+        return client
+
+    async def get(
+        self, url: str, username: str, password: str, verify_ssl: bool = False
+    ) -> httpx.Response:
+        """GET `url` on a pooled connection, honouring the per-host limit."""
+        client = self.client(username, password, verify_ssl)
+        parts = urlsplit(url)
+        host_key = (parts.scheme, parts.netloc, asyncio.get_running_loop())
+        limit = self._hosts.get(host_key)
+        if limit is None:
+            limit = self._hosts[host_key] = asyncio.Semaphore(self.max_per_host)
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            async with limit:
+                return await client.get(url)
+        finally:
+            self._in_flight[client] -= 1
+            if not self._in_flight[client]:
+                del self._in_flight[client]
+                if client in self._retired:
+                    self._close_later(client)
+
+    def _retire(self, client: httpx.AsyncClient) -> None:
+        if client in self._in_flight:
+            self._retired.add(client)
+        else:
+            self._close_later(client)
+
+    def _close_later(self, client: httpx.AsyncClient) -> None:
+        self._retired.discard(client)
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close every client created on the running loop and forget the rest."""
+        loop = asyncio.get_running_loop()
+        clients, self._clients = self._clients, {}
+        retired, self._retired = self._retired, set()
+        closing, self._closing = self._closing, set()
+        self._hosts.clear()
+        self._in_flight.clear()
+        await asyncio.gather(
+            *(
+                client.aclose()
+                for client, _, client_loop in clients.values()
+                if client_loop is loop
+            ),
+            *(client.aclose() for client in retired),
+            *(task for task in closing if task.get_loop() is loop),
+        )
+
+
+# App-wide pool used by `fetch_rnm_data`; closed from the main window
+SPA_CLIENTS = SPAClientPool()
@@ -1,7 +1,16 @@
 import ttkbootstrap as ttk
 from ttkbootstrap.tableview import Tableview
 from tkinter.filedialog import askopenfilenames
-from src.services.dh_data_service import create_dh_report_text, read_data_dh
+from src.services.dh_data_service import (
+    DH_SCHEMA_VERSION,
+    DH_TREND_PERIODS,
+    create_dh_report_text,
+    get_dh_trend_rollups,
+    read_data_dh,
+    read_data_dh_many,
+)
+from src.utils.frame_cache import FrameCache
+from src.utils.helpers import get_cache_folder
 
 import qrcode
 from PIL import ImageTk
@@ -33,6 +42,16 @@ class DHSidebar(ttk.Frame):
         self.button = ttk.Button(self, text="Get Data", bootstyle="primary", width=15)
         self.button.pack(side="top", padx=10, pady=5)
 
+        # Table view: raw defects or one of the precomputed trend rollups
+        self.view = ttk.Combobox(
+            self,
+            values=["Defects"] + [f"{period} trend" for period in DH_TREND_PERIODS],
+            width=14,
+            state="readonly",
+        )
+        self.view.pack(side="top", padx=10, pady=5)
+        self.view.set("Defects")
+
 
 class DHPage(ttk.Frame):
 
@@ -86,10 +105,18 @@ class DHUI(ttk.Frame):
     def __init__(self, parent: ttk.Frame) -> None:
         super().__init__(parent)
 
+        # Parsed exports are cached per user so re-opening a file is cheap
+        self.dh_cache = FrameCache(
+            get_cache_folder("dh"), schema_version=DH_SCHEMA_VERSION
+        )
+
         self.dh_sidebar = DHSidebar(self)
         self.dh_sidebar.pack(side="left", fill="y", expand=False)
 
         self.dh_sidebar.button.configure(command=self.on_get_data_dh)
+        self.dh_sidebar.view.bind("<<ComboboxSelected>>", self.show_dh_view)
+        self.dh_table_data = None
+        self.dh_rollups = {}
 
         ttk.Separator(self, orient="vertical").pack(
             side="left", fill="y", padx=5, pady=0
@@ -106,33 +133,21 @@ class DHUI(ttk.Frame):
             filetypes=(("CSV files", "*.csv"), ("All files", "*.*")),
         )
         if filepath:
-            # Read/prepare data in background thread, and join if multiple files
-            # If the user selected multiple files, read each file in the
-            # background thread using the service helper and concatenate them
-            # with polars so the UI doesn't need to depend on pandas.
+            # Read/prepare data in background thread. Multiple exports are
+            # scanned concurrently and merged so overlapping records are only
+            # counted once (the newest export wins).
             if len(filepath) > 1:
-
-                def _read_many(paths):
-                    # Import locally inside worker thread to avoid adding
-                    # runtime deps at module import time in the UI.
-                    import polars as pl
-
-                    dfs = [read_data_dh(p) for p in paths]
-                    # filter out empty frames (defensive)
-                    dfs = [df for df in dfs if df is not None and df.height > 0]
-                    if not dfs:
-                        return pl.DataFrame()
-
-                    # Concatenate vertically, preserving column types
-                    return pl.concat(dfs, how="vertical")
-
-                self.dh_df = await asyncio.to_thread(_read_many, filepath)
+                self.dh_df = await asyncio.to_thread(
+                    read_data_dh_many, filepath, cache=self.dh_cache
+                )
             else:
                 # Single file selected — pass only the single path to the reader
                 single_path = (
                     filepath[0] if isinstance(filepath, (list, tuple)) else filepath
                 )
-                self.dh_df = await asyncio.to_thread(read_data_dh, single_path)
+                self.dh_df = await asyncio.to_thread(
+                    read_data_dh, single_path, cache=self.dh_cache
+                )
 
             def _select_columns(df):
                 return df[
@@ -147,6 +162,9 @@ class DHUI(ttk.Frame):
 
             self.filtered_dh_df = await asyncio.to_thread(_select_columns, self.dh_df)
 
+            # Trend rollups are computed once per load; switching views reuses them
+            self.dh_rollups = await asyncio.to_thread(get_dh_trend_rollups, self.dh_df)
+
         # Build table data in background thread
         rowdata = await asyncio.to_thread(
             lambda df: [list(row.values()) for row in df.to_dicts()],
@@ -165,7 +183,8 @@ class DHUI(ttk.Frame):
         )
 
         # Update GUI table on main thread
-        self.dh_page.dh_table.build_table_data(coldata=coldata, rowdata=rowdata)
+        self.dh_table_data = (coldata, rowdata)
+        self.show_dh_view()
 
         # Create report text in background thread then update GUI
         report_text = await asyncio.to_thread(create_dh_report_text, self.dh_df)
@@ -192,3 +211,21 @@ class DHUI(ttk.Frame):
         self.dh_page.qr_code_label.configure(image=qr_img_tk, text="")
         self.dh_page.qr_code_label.image = qr_img_tk
         self.dh_page._qr_image = qr_img_tk
+
+    def show_dh_view(self, event=None) -> None:
+        # Switch the table between the loaded defects and a trend rollup
+        view = self.dh_sidebar.view.get()
+        if view == "Defects":
+            if self.dh_table_data is None:
+                return
+            coldata, rowdata = self.dh_table_data
+        else:
+            rollup = self.dh_rollups.get(view.split()[0])
+            if rollup is None:
+                return
+            coldata = [
+                {"text": col, "stretch": False, "width": 100} for col in rollup.columns
+            ]
+            rowdata = rollup.rows()
+
+        self.dh_page.dh_table.build_table_data(coldata=coldata, rowdata=rowdata)
@@ -3,17 +3,38 @@ import ttkbootstrap as ttk
 from ttkbootstrap.tableview import Tableview
 
 from src.services.mps_data_service import (
+    MPS_COLUMNS,
+    MPS_SCHEMA_VERSION,
     create_report_text,
-    filter_data_mps_by_date_and_shift,
-    filter_data_mps_by_weeknumber,
-    read_data_mps,
+    create_week_reports,
+    export_reports,
+    read_data_mps_cached,
 )
+from src.services.mps_index import MPSIndex
 from src.utils.app_config import read_config
-import qrcode
+from src.utils.file_watcher import PollingFileWatcher
+from src.utils.frame_cache import FrameCache, frame_content_hash
+from src.utils.helpers import get_cache_folder
+from src.utils.rnm_ui_helpers import make_qr_image
+from tkinter import messagebox
+from tkinter.filedialog import askdirectory
 from PIL import ImageTk
 import asyncio
+import polars as pl
 from async_tkinter_loop import async_handler
 
+# Suffix shown next to a link-up in the combobox while/after it preloads
+LOAD_MARKS = {"loading": "…", "ready": "✓", "error": "✗"}
+
+# How often the configured workbooks are stat'ed for changes
+MPS_POLL_MS = 5000
+
+
+def iso_weeks_in_year(year: int) -> int:
+    """Return 52 or 53, the number of ISO weeks in `year`."""
+    # 28 December always falls in the last ISO week of its year
+    return datetime.date(year, 12, 28).isocalendar()[1]
+
 
 class MPSSidebar(ttk.Frame):
 
@@ -38,6 +59,8 @@ class MPSSidebar(ttk.Frame):
 
         self.linkup = ttk.Combobox(self, width=14)
         self.linkup.pack(side="top", padx=10, pady=5)
+        # Combobox label -> link-up name, see `set_linkup_states`
+        self._linkup_labels: dict[str, str] = {}
 
         self.year = ttk.Combobox(
             self, values=[str(i) for i in range(2020, 2031)], width=14
@@ -47,7 +70,12 @@ class MPSSidebar(ttk.Frame):
         self.year.bind("<<ComboboxSelected>>", self.update_weekdate)
 
         self.weeknum = ttk.Combobox(
-            self, values=[f"Week {i}" for i in range(1, 53)], width=14
+            self,
+            values=[
+                f"Week {i}"
+                for i in range(1, iso_weeks_in_year(int(self.year.get())) + 1)
+            ],
+            width=14,
         )
         self.weeknum.pack(side="top", padx=10, pady=5)
         # set default week number to current week number
@@ -77,6 +105,13 @@ class MPSSidebar(ttk.Frame):
         self.shift.pack(side="top", padx=10, pady=5)
         self.shift.set("Shift 1")
 
+        # Week table: planned activities or plan-vs-actual adherence
+        self.view = ttk.Combobox(
+            self, values=["Activities", "Adherence"], width=14, state="readonly"
+        )
+        self.view.pack(side="top", padx=10, pady=5)
+        self.view.set("Activities")
+
         ttk.Separator(self, orient="horizontal").pack(
             side="top", fill="x", padx=5, pady=5
         )
@@ -84,7 +119,18 @@ class MPSSidebar(ttk.Frame):
         self.button = ttk.Button(self, text="Get Data", bootstyle="primary", width=15)
         self.button.pack(side="top", padx=10, pady=5)
 
+        self.export_button = ttk.Button(
+            self, text="Export Week", bootstyle="secondary", width=15
+        )
+        self.export_button.pack(side="top", padx=10, pady=5)
+
     def update_weekdate(self, event=None) -> None:
+        year = int(self.year.get())
+        weeks = iso_weeks_in_year(year)
+        self.weeknum["values"] = [f"Week {i}" for i in range(1, weeks + 1)]
+        if int(self.weeknum.get().split()[1]) > weeks:
+            self.weeknum.set(f"Week {weeks}")
+
         weekdate_values = []
         for i in range(7):
             date = datetime.date.fromisocalendar(
@@ -94,6 +140,23 @@ class MPSSidebar(ttk.Frame):
         self.weekdate["values"] = weekdate_values
         self.weekdate.set(weekdate_values[0])
 
+    def set_linkup_states(self, links: list[str], states: dict[str, str]) -> None:
+        """Show each link-up with its load state, keeping the selection."""
+        selected = self.selected_linkup()
+        self._linkup_labels = {
+            (f"{link} {LOAD_MARKS[states[link]]}" if link in states else link): link
+            for link in links
+        }
+        labels = list(self._linkup_labels)
+        self.linkup.configure(values=labels)
+        if selected in links:
+            self.linkup.set(labels[links.index(selected)])
+
+    def selected_linkup(self) -> str:
+        """Return the selected link-up name without its load-state mark."""
+        label = self.linkup.get()
+        return self._linkup_labels.get(label, label)
+
 
 class MPSPage(ttk.Frame):
 
@@ -141,12 +204,16 @@ class MPSUI(ttk.Frame):
     def __init__(self, parent: ttk.Frame) -> None:
         super().__init__(parent)
         self.cfg = read_config(section="MPS")
+        self.mps_cache = FrameCache(
+            get_cache_folder("mps"), schema_version=MPS_SCHEMA_VERSION
+        )
 
         self.mps_sidebar = MPSSidebar(self)
         self.mps_sidebar.pack(side="left", fill="y", expand=False)
         self.mps_sidebar.linkup.configure(values=self.cfg.link_up)
         self.mps_sidebar.linkup.set(self.cfg.link_up[0])
         self.mps_sidebar.button.configure(command=self.on_get_data_mps)
+        self.mps_sidebar.export_button.configure(command=self.on_export_week)
 
         ttk.Separator(self, orient="vertical").pack(
             side="left", fill="y", padx=5, pady=0
@@ -154,91 +221,209 @@ class MPSUI(ttk.Frame):
         self.mps_page = MPSPage(self)
         self.mps_page.pack(side="left", fill="both", expand=True)
 
+        self.mps_index: MPSIndex | None = None
+        # Parsed frame and its index per link-up, filled by the preloader
+        self.mps_indexes: dict[str, tuple[pl.DataFrame, MPSIndex]] = {}
+        self.mps_load_state: dict[str, str] = {}
+        # Content hash of the frame behind each entry of `mps_indexes`
+        self.mps_hashes: dict[str, str] = {}
+        self.mps_watcher = PollingFileWatcher(self.cfg.file_path or ())
+        self.mps_sidebar.linkup.bind("<<ComboboxSelected>>", self.on_get_data_mps)
+        for combo in (
+            self.mps_sidebar.year,
+            self.mps_sidebar.weeknum,
+            self.mps_sidebar.weekdate,
+            self.mps_sidebar.shift,
+            self.mps_sidebar.view,
+        ):
+            combo.bind("<<ComboboxSelected>>", self.on_mps_selection, add="+")
+
+        # Warm every configured workbook once the main loop is running
+        self.after_idle(self.preload_mps_workbooks)
+        self.after(MPS_POLL_MS, self.watch_mps_workbooks)
+
+    def load_mps_linkup(
+        self, link_up: str, path: str, sheet_name: str | None
+    ) -> tuple[pl.DataFrame, MPSIndex]:
+        """Read (or fetch from cache) a link-up's workbook and index it.
+
+        Runs in a worker thread. The index is reused for as long as the cache
+        hands back the same frame, i.e. until the workbook changes.
+        """
+        df = read_data_mps_cached(path, sheet_name, self.mps_cache)
+        cached = self.mps_indexes.get(link_up)
+        if cached is not None and cached[0] is df:
+            return cached
+        entry = (df, MPSIndex(df))
+        self.mps_hashes[link_up] = frame_content_hash(df)
+        self.mps_indexes[link_up] = entry
+        return entry
+
+    @async_handler
+    async def watch_mps_workbooks(self) -> None:
+        """Reload workbooks saved since the last poll and refresh the view."""
+        try:
+            changed = await asyncio.to_thread(self.mps_watcher.poll)
+            links = list(self.cfg.link_up)
+            for path in changed:
+                link_up = links[list(self.cfg.file_path).index(path)]
+                before = self.mps_hashes.get(link_up)
+                try:
+                    df, index = await asyncio.to_thread(
+                        self.load_mps_linkup, link_up, path, self.cfg.sheet_name
+                    )
+                    self.mps_load_state[link_up] = "ready"
+                except Exception:
+                    # Shown as failed; "Get Data" re-reads and reports the error
+                    self.mps_load_state[link_up] = "error"
+                    continue
+                finally:
+                    self.mps_sidebar.set_linkup_states(links, self.mps_load_state)
+
+                # Only redraw when the shown link-up's content really changed
+                showing = self.mps_index is not None and (
+                    self.mps_sidebar.selected_linkup() == link_up
+                )
+                if showing and self.mps_hashes[link_up] != before:
+                    self.mps_df, self.mps_index = df, index
+                    await self.refresh_mps_view()
+        finally:
+            self.after(MPS_POLL_MS, self.watch_mps_workbooks)
+
+    @async_handler
+    async def preload_mps_workbooks(self) -> None:
+        """Parse all configured workbooks concurrently in worker threads."""
+        links = list(self.cfg.link_up)
+        jobs = list(zip(links, self.cfg.file_path or ()))
+        self.mps_load_state = {link: "loading" for link, _ in jobs}
+        self.mps_sidebar.set_linkup_states(links, self.mps_load_state)
+
+        async def _preload(link_up: str, path: str) -> None:
+            try:
+                await asyncio.to_thread(
+                    self.load_mps_linkup, link_up, path, self.cfg.sheet_name
+                )
+                self.mps_load_state[link_up] = "ready"
+            except Exception:
+                # Reported again (with traceback) if the user opens it
+                self.mps_load_state[link_up] = "error"
+            self.mps_sidebar.set_linkup_states(links, self.mps_load_state)
+
+        await asyncio.gather(*(_preload(link, path) for link, path in jobs))
+
     @async_handler
-    async def on_get_data_mps(self) -> None:
+    async def on_get_data_mps(self, event=None) -> None:
         try:
             # Implement the logic to handle the "Get Data" button click
             # Prefer the path configured under the `MPS` section in config.ini.
             cfg = read_config(section="MPS")
-            path = cfg.file_path[cfg.link_up.index(self.mps_sidebar.linkup.get())]
+            link_up = self.mps_sidebar.selected_linkup()
+            path = cfg.file_path[cfg.link_up.index(link_up)]
             sheet_name = cfg.sheet_name
 
-            # Read data in background thread
-            self.mps_df = await asyncio.to_thread(
-                read_data_mps, path, sheet_name=sheet_name
+            # Read and index in a background thread; once preloaded (and while
+            # the workbook is unchanged) this is a cache hit
+            self.mps_df, self.mps_index = await asyncio.to_thread(
+                self.load_mps_linkup, link_up, path, sheet_name
             )
 
-            selected_year = int(self.mps_sidebar.year.get())
-            selected_week = self.mps_sidebar.weeknum.get()
-            week_number = int(selected_week.split(" ")[1])
-            selected_day = self.mps_sidebar.weekdate.get()
-            selected_shift = self.mps_sidebar.shift.get()
+            await self.refresh_mps_view()
+        except Exception as e:
+            self.show_mps_error(e)
+            raise e
 
-            # Prepare filtered table data in background thread
-            filtered_df_by_week = await asyncio.to_thread(
-                filter_data_mps_by_weeknumber, self.mps_df, week_number, selected_year
-            )
+    @async_handler
+    async def on_mps_selection(self, event=None) -> None:
+        # Navigating weeks/days/shifts only re-renders from the loaded index
+        if self.mps_index is None:
+            return
+        try:
+            await self.refresh_mps_view()
+        except Exception as e:
+            self.show_mps_error(e)
+            raise e
 
-            rowdata = await asyncio.to_thread(
-                lambda df: [list(row.values()) for row in df.to_dicts()],
-                filtered_df_by_week,
+    async def refresh_mps_view(self) -> None:
+        selected_year = int(self.mps_sidebar.year.get())
+        selected_week = self.mps_sidebar.weeknum.get()
+        week_number = int(selected_week.split(" ")[1])
+        selected_day = self.mps_sidebar.weekdate.get()
+        selected_shift = self.mps_sidebar.shift.get()
+
+        if self.mps_sidebar.view.get() == "Adherence":
+            filtered_df_by_week = self.mps_index.adherence(
+                selected_year, week_number
+            ).with_columns(pl.col("Adherence").round(2))
+        else:
+            filtered_df_by_week = self.mps_index.week(
+                selected_year, week_number
+            ).select(MPS_COLUMNS)
+        rowdata = [list(row) for row in filtered_df_by_week.iter_rows()]
+        coldata = [
+            (
+                {"text": col, "stretch": True, "width": 300}
+                if col == "Activity Description"
+                else {"text": col, "stretch": False, "width": 100}
             )
+            for col in filtered_df_by_week.columns
+        ]
 
-            coldata = await asyncio.to_thread(
-                lambda df: [
-                    (
-                        {"text": col, "stretch": True, "width": 300}
-                        if col == "Activity Description"
-                        else {"text": col, "stretch": False, "width": 100}
-                    )
-                    for col in df.columns
-                ],
-                filtered_df_by_week,
-            )
+        # Update GUI table on main thread
+        self.mps_page.mps_table.build_table_data(coldata=coldata, rowdata=rowdata)
 
-            # Update GUI table on main thread
-            self.mps_page.mps_table.build_table_data(coldata=coldata, rowdata=rowdata)
+        report_df = self.mps_index.date_and_shift(
+            selected_day, int(selected_shift.split(" ")[1])
+        )
+        report_text = create_report_text(report_df)
 
-            # Prepare report data in background thread
-            report_df = await asyncio.to_thread(
-                filter_data_mps_by_date_and_shift,
-                self.mps_df,
-                selected_day,
-                int(selected_shift.split(" ")[1]),
-            )
-            report_text = await asyncio.to_thread(create_report_text, report_df)
-
-            # Update report widget on main thread
-            self.mps_page.report_text.delete("1.0", "end")
-            self.mps_page.report_text.insert("1.0", report_text)
-
-            # Generate QR (PIL image) in background thread, convert to ImageTk in main thread
-            def _make_qr_image(text: str):
-                qr = qrcode.QRCode(
-                    version=None,
-                    error_correction=qrcode.constants.ERROR_CORRECT_Q,
-                    box_size=6,
-                    border=2,
+        # Update report widget on main thread
+        self.mps_page.report_text.delete("1.0", "end")
+        self.mps_page.report_text.insert("1.0", report_text)
+
+        # Generate QR (PIL image) in background thread, convert to ImageTk in main thread
+        qr_img = await asyncio.to_thread(make_qr_image, report_text)
+        qr_img_tk = ImageTk.PhotoImage(qr_img)
+
+        self.mps_page.qr_code_label.configure(image=qr_img_tk, text="")
+        self.mps_page.qr_code_label.image = qr_img_tk
+        self.mps_page._qr_image = qr_img_tk
+
+    @async_handler
+    async def on_export_week(self) -> None:
+        """Write every date/shift report of the selected week (+ QR codes)."""
+        try:
+            if self.mps_index is None:
+                cfg = read_config(section="MPS")
+                link_up = self.mps_sidebar.selected_linkup()
+                path = cfg.file_path[cfg.link_up.index(link_up)]
+                self.mps_df, self.mps_index = await asyncio.to_thread(
+                    self.load_mps_linkup, link_up, path, cfg.sheet_name
                 )
-                qr.add_data(text)
-                qr.make(fit=True)
-                primary_color = "#000000"
-                img = qr.make_image(fill_color=primary_color, back_color="orange")
-                return img.resize((400, 400))
-
-            qr_img = await asyncio.to_thread(_make_qr_image, report_text)
-            qr_img_tk = ImageTk.PhotoImage(qr_img)
-
-            self.mps_page.qr_code_label.configure(image=qr_img_tk, text="")
-            self.mps_page.qr_code_label.image = qr_img_tk
-            self.mps_page._qr_image = qr_img_tk
+
+            year = int(self.mps_sidebar.year.get())
+            week = int(self.mps_sidebar.weeknum.get().split(" ")[1])
+            reports = create_week_reports(self.mps_index.week(year, week))
+            if not reports:
+                messagebox.showinfo("MPS", f"No activities in week {week} of {year}")
+                return
+
+            folder = askdirectory(title="Export MPS week reports to")
+            if not folder:
+                return
+            await asyncio.to_thread(export_reports, reports, folder)
+            messagebox.showinfo(
+                "MPS", f"{len(reports)} reports of week {week} written to {folder}"
+            )
         except Exception as e:
-            import traceback
-
-            error_msg = f"Terjadi error:\n{e}\n\n{traceback.format_exc()}"
-            self.mps_page.report_text.delete("1.0", "end")
-            self.mps_page.report_text.insert("1.0", error_msg)
-            self.mps_page.qr_code_label.configure(image="", text="Error")
-            self.mps_page.qr_code_label.image = None
-            self.mps_page._qr_image = None
+            self.show_mps_error(e)
             raise e
+
+    def show_mps_error(self, e: Exception) -> None:
+        import traceback
+
+        error_msg = f"Terjadi error:\n{e}\n\n{traceback.format_exc()}"
+        self.mps_page.report_text.delete("1.0", "end")
+        self.mps_page.report_text.insert("1.0", error_msg)
+        self.mps_page.qr_code_label.configure(image="", text="Error")
+        self.mps_page.qr_code_label.image = None
+        self.mps_page._qr_image = None
@@ -1,4 +1,5 @@
 import asyncio
+import tkinter as tk
 from tkinter.filedialog import askopenfilename
 from async_tkinter_loop import async_handler
 import logging
@@ -12,8 +13,11 @@ from src.utils.app_config import read_config
 
 from src.services.rnm_data_service import (
     get_spa_net_production,
+    get_spa_net_production_for_days,
     read_sap_consumption_data,
 )
+from src.utils.helpers import get_cache_folder
+from src.utils.spa_cache import NetProductionDayCache, SPAResponseCache
 from src.utils.spa_processor import get_spa_url
 from src.utils.rnm_helpers import sanitize_linkup
 from src.utils.rnm_ui_helpers import (
@@ -117,6 +121,15 @@ class RnMSidebar(ttk.Frame):
         # self.shift.pack(side="top", padx=10, pady=5)
         # self.shift.set("Shift 1")
 
+        # Re-download SPA data even if a cached response is still valid
+        self.bypass_cache = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self,
+            text="Bypass cache",
+            variable=self.bypass_cache,
+            bootstyle="round-toggle",
+        ).pack(side="top", padx=10, pady=5, anchor="w")
+
         ttk.Separator(self, orient="horizontal").pack(
             side="top", fill="x", padx=5, pady=5
         )
@@ -190,6 +203,8 @@ class RnMUI(ttk.Frame):
 
         self.app_cfg = read_config()
         self.cfg_rnm = read_config(section="RNM")
+        self.spa_cache = SPAResponseCache(get_cache_folder("spa"))
+        self.spa_days = NetProductionDayCache(get_cache_folder("spa"))
 
         self.rnm_sidebar = RnMSidebar(self)
         self.rnm_sidebar.pack(side="left", fill="y", expand=False)
@@ -322,21 +337,36 @@ class RnMUI(ttk.Frame):
         # sanitize linkup value - remove leading 'LU' only
         sanitized_linkup = sanitize_linkup(linkup_value)
 
-        url = get_spa_url(
-            self.app_cfg.environment,
-            sanitized_linkup,
-            start_date.strftime("%Y-%m-%d"),
-            end_date.strftime("%Y-%m-%d"),
-        )
-
         # Fetch SPA net production safely
         try:
-            net_product = await get_spa_net_production(
-                url,
-                self.app_cfg.username,
-                self.app_cfg.password,
-                verify_ssl=self.app_cfg.verify_ssl,
-            )
+            if self.app_cfg.environment.lower() == "production":
+                # Summed from per-day results; only uncached days hit SPA
+                net_product = await get_spa_net_production_for_days(
+                    sanitized_linkup,
+                    start_date,
+                    end_date,
+                    self.app_cfg.username,
+                    self.app_cfg.password,
+                    verify_ssl=self.app_cfg.verify_ssl,
+                    cache=self.spa_days,
+                    page_cache=self.spa_cache,
+                    refresh=self.rnm_sidebar.bypass_cache.get(),
+                )
+            else:
+                url = get_spa_url(
+                    self.app_cfg.environment,
+                    sanitized_linkup,
+                    start_date.strftime("%Y-%m-%d"),
+                    end_date.strftime("%Y-%m-%d"),
+                )
+                net_product = await get_spa_net_production(
+                    url,
+                    self.app_cfg.username,
+                    self.app_cfg.password,
+                    verify_ssl=self.app_cfg.verify_ssl,
+                    cache=self.spa_cache,
+                    refresh=self.rnm_sidebar.bypass_cache.get(),
+                )
         except Exception as exc:
             logging.exception("Failed to fetch SPA net production")
             messagebox.showwarning(
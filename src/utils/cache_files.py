@@ -0,0 +1,73 @@
+"""Entry-file helpers shared by the on-disk caches.
+
+Caching is best-effort: every helper swallows `OSError` so a read-only or
+locked profile folder never breaks the load it was meant to speed up.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable
+
+
+def write_entry(entry: Path, write: Callable[[Path], object]) -> bool:
+    """Create `entry` atomically via `write(tmp_path)`; return True on success.
+
+    The content goes to a temp file next to `entry` that then replaces it,
+    so readers never see a partial entry.
+    """
+    tmp = entry.with_name(f"{entry.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        write(tmp)
+        os.replace(tmp, entry)
+    except OSError:
+        remove_entry(tmp)
+        return False
+    return True
+
+
+def touch_entry(entry: Path) -> None:
+    """Mark `entry` as recently used for `evict_entries`."""
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+
+def remove_entry(entry: Path) -> bool:
+    """Delete `entry`; return False if it is missing or still in use."""
+    try:
+        entry.unlink()
+        return True
+    except OSError:
+        # On Windows a memory-mapped entry cannot be removed while in use
+        return False
+
+
+def evict_entries(folder: Path, pattern: str, max_bytes: int) -> None:
+    """Drop the least recently used `pattern` files until `folder` fits `max_bytes`.
+
+    Recency is the file mtime, refreshed by `touch_entry` on every hit.
+    """
+    try:
+        entries = []
+        for entry in folder.glob(pattern):
+            st = entry.stat()
+            entries.append((st.st_mtime_ns, st.st_size, entry))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        if remove_entry(entry):
+            total -= size
+
+
+def clear_entries(folder: Path, pattern: str) -> None:
+    """Remove every `pattern` file in `folder`."""
+    for entry in folder.glob(pattern):
+        remove_entry(entry)
@@ -0,0 +1,58 @@
+"""Stat-based change detection for workbooks on slow or network drives."""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Callable, Iterable
+
+from .frame_cache import file_fingerprint
+
+
+def is_lock_file(path: str | os.PathLike) -> bool:
+    """Return True for Office owner/lock files such as ``~$Book.xlsx``."""
+    return os.path.basename(os.fspath(path)).startswith("~$")
+
+
+class PollingFileWatcher:
+    """Report files whose size/mtime changed and then stayed put.
+
+    `poll` only stats the watched paths, so it is cheap enough to call every
+    few seconds even over a network share. A change is reported once the new
+    fingerprint has been stable for `debounce` seconds: a burst of saves (or
+    Excel's write-then-rename dance) yields a single event, and a file that
+    is missing or still growing is never reported mid-save. Office lock
+    files (``~$...``) are ignored.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[str | os.PathLike],
+        debounce: float = 3.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.debounce = debounce
+        self._clock = clock
+        self.paths = [os.fspath(p) for p in paths if not is_lock_file(p)]
+        self._seen = {p: file_fingerprint(p) for p in self.paths}
+        # path -> (candidate fingerprint, when it was first observed)
+        self._pending: dict[str, tuple[tuple | None, float]] = {}
+
+    def poll(self) -> list[str]:
+        """Stat every watched path and return those with a settled change."""
+        now = self._clock()
+        changed = []
+        for path in self.paths:
+            current = file_fingerprint(path)
+            if current == self._seen[path]:
+                self._pending.pop(path, None)
+                continue
+            candidate = self._pending.get(path)
+            if candidate is None or candidate[0] != current:
+                # New or still-moving change: (re)start the quiet period
+                self._pending[path] = (current, now)
+            elif current is not None and now - candidate[1] >= self.debounce:
+                del self._pending[path]
+                self._seen[path] = current
+                changed.append(path)
+        return changed
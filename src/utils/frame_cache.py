@@ -0,0 +1,232 @@
+"""On-disk and in-memory caches for parsed polars frames."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable
+
+import polars as pl
+
+from .cache_files import (
+    clear_entries,
+    evict_entries,
+    remove_entry,
+    touch_entry,
+    write_entry,
+)
+
+# Default upper bound for a single cache folder (all entries together).
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_fingerprint(path: str | os.PathLike, *extra: Hashable) -> tuple | None:
+    """Return a cheap fingerprint of `path` based on its stat metadata.
+
+    The fingerprint is ``(normalized path, size, mtime_ns, *extra)`` so it
+    changes whenever the file is rewritten. Returns None when the file cannot
+    be stat'ed (missing, permission error on a network share, ...).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    norm = os.path.normcase(os.path.abspath(os.fspath(path)))
+    return (norm, st.st_size, st.st_mtime_ns, *extra)
+
+
+def _current_fingerprint(
+    path: str | os.PathLike, extra: tuple, before: tuple | None
+) -> tuple | None:
+    # The key to store a freshly parsed frame under, or None if the file
+    # changed while it was parsed (the frame may be old or half-saved)
+    current = file_fingerprint(path, *extra)
+    if before is not None and current != before:
+        return None
+    return current
+
+
+def _digest(value: object) -> str:
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()[:16]
+
+
+def frame_content_hash(df: pl.DataFrame) -> str:
+    """Return a digest of the schema and the (ordered) rows of `df`.
+
+    Used to tell whether a re-read file actually changed what is displayed,
+    e.g. a workbook saved without edits or with edits outside the parsed
+    columns.
+    """
+    rows = df.hash_rows(seed=0).implode().hash(seed=0).item()
+    return _digest((list(df.schema.items()), rows))
+
+
+class FrameCache:
+    """Store parsed frames as Arrow IPC files keyed by source file fingerprint.
+
+    Entries are named ``<path digest>-<fingerprint digest>.arrow`` inside
+    `folder`. A hit is memory-mapped with ``pl.read_ipc`` so repeated loads skip
+    CSV/Excel parsing and dtype inference entirely. The `schema_version` is part
+    of the key: bump it whenever the loader changes the shape of the frame it
+    caches so older entries are ignored (and eventually evicted).
+
+    Eviction is least-recently-used by file mtime (refreshed on every hit) and
+    keeps the folder below `max_bytes`.
+    """
+
+    SUFFIX = ".arrow"
+
+    def __init__(
+        self,
+        folder: str | os.PathLike,
+        schema_version: int = 1,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.folder = Path(folder)
+        self.schema_version = schema_version
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, fingerprint: tuple) -> Path:
+        source_digest = _digest((fingerprint[0], *fingerprint[3:]))
+        key_digest = _digest((fingerprint, self.schema_version))
+        return self.folder / f"{source_digest}-{key_digest}{self.SUFFIX}"
+
+    def get(self, path: str | os.PathLike, *extra: Hashable) -> pl.DataFrame | None:
+        """Return the cached frame for `path`, or None on a miss."""
+        fingerprint = file_fingerprint(path, *extra)
+        if fingerprint is None:
+            return None
+        entry = self._entry_path(fingerprint)
+        if not entry.exists():
+            return None
+        try:
+            df = pl.read_ipc(entry, memory_map=True)
+        except Exception:
+            # Corrupt/partial entry: drop it and let the caller re-parse.
+            remove_entry(entry)
+            return None
+        touch_entry(entry)
+        return df
+
+    def put(
+        self,
+        path: str | os.PathLike,
+        df: pl.DataFrame,
+        *extra: Hashable,
+        fingerprint: tuple | None = None,
+    ) -> None:
+        """Store `df` for `path`, replacing stale entries for the same source.
+
+        Pass the `fingerprint` taken before `df` was parsed: if the file has
+        changed since (saved mid-parse), nothing is stored.
+        """
+        fingerprint = _current_fingerprint(path, extra, fingerprint)
+        if fingerprint is None:
+            return
+        entry = self._entry_path(fingerprint)
+        # IPC allows one dictionary per Categorical/Enum field, so a frame
+        # collected in several chunks has to be written as one
+        data = df.rechunk()
+        if not write_entry(
+            entry, lambda tmp: data.write_ipc(tmp, compression="uncompressed")
+        ):
+            return
+
+        prefix = entry.name.split("-", 1)[0] + "-"
+        for old in self.folder.glob(f"{prefix}*{self.SUFFIX}"):
+            if old != entry:
+                remove_entry(old)
+        self.evict()
+
+    def get_or_load(
+        self,
+        path: str | os.PathLike,
+        loader: Callable[[str | os.PathLike], pl.DataFrame],
+        *extra: Hashable,
+    ) -> pl.DataFrame:
+        """Return the cached frame for `path` or call `loader(path)` and cache it."""
+        df = self.get(path, *extra)
+        if df is None:
+            fingerprint = file_fingerprint(path, *extra)
+            df = loader(path)
+            self.put(path, df, *extra, fingerprint=fingerprint)
+        return df
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries until the folder fits `max_bytes`."""
+        evict_entries(self.folder, f"*{self.SUFFIX}", self.max_bytes)
+
+    def clear(self) -> None:
+        """Remove every entry in the cache folder."""
+        clear_entries(self.folder, f"*{self.SUFFIX}")
+
+
+class FrameLRU:
+    """In-memory LRU of parsed frames keyed by source file fingerprint.
+
+    Complements `FrameCache` for the current session: a hit costs one
+    `os.stat` and returns the very same (immutable) frame object. Safe to
+    share between worker threads.
+    """
+
+    def __init__(self, maxsize: int = 8) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, pl.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str | os.PathLike, *extra: Hashable) -> pl.DataFrame | None:
+        """Return the frame for the current version of `path`, or None."""
+        key = file_fingerprint(path, *extra)
+        if key is None:
+            return None
+        with self._lock:
+            df = self._entries.get(key)
+            if df is not None:
+                self._entries.move_to_end(key)
+            return df
+
+    def put(
+        self,
+        path: str | os.PathLike,
+        df: pl.DataFrame,
+        *extra: Hashable,
+        fingerprint: tuple | None = None,
+    ) -> None:
+        """Remember `df` for the version of `path` it was parsed from.
+
+        Like `FrameCache.put`, nothing is stored if `fingerprint` no longer
+        matches the file.
+        """
+        key = _current_fingerprint(path, extra, fingerprint)
+        if key is None:
+            return
+        with self._lock:
+            # Older versions of the same source can never be hit again
+            for old in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[old]
+            self._entries[key] = df
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_load(
+        self,
+        path: str | os.PathLike,
+        loader: Callable[[str | os.PathLike], pl.DataFrame],
+        *extra: Hashable,
+    ) -> pl.DataFrame:
+        """Return the remembered frame for `path` or call `loader(path)`."""
+        df = self.get(path, *extra)
+        if df is None:
+            fingerprint = file_fingerprint(path, *extra)
+            df = loader(path)
+            self.put(path, df, *extra, fingerprint=fingerprint)
+        return df
+
+    def clear(self) -> None:
+        """Forget every remembered frame."""
+        with self._lock:
+            self._entries.clear()
@@ -1,5 +1,8 @@
+import os
+import re
 import sys
 from pathlib import Path
+from typing import Iterable
 import warnings
 import polars as pl
 
@@ -43,6 +46,24 @@ def get_script_folder() -> str:
     return str(Path(sys.modules["__main__"].__file__).resolve().parent)
 
 
+def get_cache_folder(name: str = "") -> Path:
+    """
+    Get the per-user folder used for on-disk data caches.
+
+    Uses LOCALAPPDATA on Windows (falling back to APPDATA / the home folder
+    like `read_config` does) so caches never land next to a read-only exe.
+
+    Args:
+        name (str): Optional sub-folder, e.g. "dh" or "mps".
+
+    Returns:
+        Path: The cache folder (not created here).
+    """
+    base = os.getenv("LOCALAPPDATA") or os.getenv("APPDATA")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "PM-Champion-Dashboard" / "cache" / name
+
+
 def safe_read_excel(*args, **kwargs) -> pl.DataFrame:
     """Read Excel via polars while suppressing dtype inference warnings.
 
@@ -91,3 +112,146 @@ def safe_read_csv(*args, **kwargs) -> pl.DataFrame:
         finally:
             sys.stderr = old_stderr
             devnull.close()
+
+
+def parse_datetime_formats(
+    expr: pl.Expr, formats: Iterable[str], time_unit: str = "us"
+) -> pl.Expr:
+    """
+    Parse a String expression trying several datetime formats, first match wins.
+
+    Each format is tried with a non-strict `str.to_datetime` and the attempts
+    are combined with `pl.coalesce`, so the whole column is normalized in one
+    vectorized pass. Values matching no format become null. Put the most
+    common format first: ambiguous values (e.g. 07/10/2025) take the first
+    format that parses them.
+
+    Args:
+        expr (pl.Expr): String expression holding the raw values.
+        formats (Iterable[str]): strftime-style formats, in priority order.
+        time_unit (str): Time unit of the resulting Datetime.
+
+    Returns:
+        pl.Expr: Datetime expression.
+    """
+    text = expr.str.strip_chars()
+    return pl.coalesce(
+        text.str.to_datetime(fmt, time_unit=time_unit, strict=False) for fmt in formats
+    )
+
+
+# What `datetime.strptime` matches for each directive (from the stdlib
+# `_strptime` module). polars/chrono is more lenient, e.g. it takes "24"
+# for %Y, so values are checked against these first.
+_STRPTIME_PATTERNS = {
+    # four digits, but `datetime` rejects year 0
+    "%Y": r"(?:000[1-9]|00[1-9]\d|0[1-9]\d\d|[1-9]\d\d\d)",
+    "%m": r"(?:1[0-2]|0[1-9]|[1-9])",
+    "%d": r"(?:3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    "%H": r"(?:2[0-3]|[0-1]\d|\d)",
+    "%M": r"(?:[0-5]\d|\d)",
+    # strptime also matches 60/61 but `datetime` then rejects them
+    "%S": r"(?:[0-5]\d|\d)",
+}
+
+
+def strptime_pattern(fmt: str) -> str:
+    """
+    Return a regex for the strings `datetime.strptime(s, fmt)` can match.
+
+    Only the directives in `_STRPTIME_PATTERNS` are supported. Like
+    strptime, matching ignores case and any whitespace run in `fmt` matches
+    one or more whitespace characters. Calendar checks (e.g. 31/02) are left
+    to the parser.
+
+    Args:
+        fmt (str): strftime-style format.
+
+    Returns:
+        str: Regex anchored at both ends.
+    """
+    parts = []
+    for part in re.split(r"(%.)", fmt):
+        if part.startswith("%"):
+            if part not in _STRPTIME_PATTERNS:
+                raise ValueError(f"Unsupported strptime directive: {part}")
+            parts.append(_STRPTIME_PATTERNS[part])
+        else:
+            parts.append(r"\s+".join(re.escape(p) for p in re.split(r"\s+", part)))
+    return "(?i)^" + "".join(parts) + "$"
+
+
+def parse_date_formats(expr: pl.Expr, formats: Iterable[str]) -> pl.Expr:
+    """
+    Parse a String expression to Date trying several formats, first match wins.
+
+    Date counterpart of `parse_datetime_formats`; formats with a time part
+    keep only the date. A value only matches a format when
+    `datetime.strptime` would accept it too (see `strptime_pattern`), so
+    the result equals trying the formats with strptime in a Python loop.
+
+    Args:
+        expr (pl.Expr): String expression holding the raw values.
+        formats (Iterable[str]): strftime-style formats, in priority order.
+
+    Returns:
+        pl.Expr: Date expression.
+    """
+    text = expr.str.strip_chars()
+    # strptime ignores case, chrono does not (e.g. the "T" separator)
+    upper = text.str.to_uppercase()
+    return pl.coalesce(
+        pl.when(text.str.contains(strptime_pattern(fmt)))
+        .then(upper)
+        .str.to_date(fmt, strict=False)
+        for fmt in formats
+    )
+
+
+def parse_iso_date(expr: pl.Expr) -> pl.Expr:
+    """
+    Parse a String expression the way `datetime.date.fromisoformat` does.
+
+    Accepts ``YYYY-MM-DD``, ``YYYYMMDD`` and the ISO week dates
+    ``YYYY-Www[-D]`` / ``YYYYWww[D]``, all strictly zero-padded; anything
+    else (surrounding blanks included) becomes null. Like CPython, two
+    extra characters after ``YYYYMMDD`` or ``YYYYWwwD`` are ignored.
+
+    Args:
+        expr (pl.Expr): String expression holding the raw values.
+
+    Returns:
+        pl.Expr: Date expression.
+    """
+    # Years 0001-9999, as `datetime.date` allows
+    year = "(?:000[1-9]|00[1-9][0-9]|0[1-9][0-9]{2}|[1-9][0-9]{3})"
+    calendar = (
+        pl.when(expr.str.contains(f"^{year}-[0-9]{{2}}-[0-9]{{2}}$"))
+        .then(expr)
+        .str.to_date("%Y-%m-%d", strict=False)
+    )
+    basic = (
+        pl.when(expr.str.contains(f"^{year}[0-9]{{4}}(?s:..)?$"))
+        .then(expr.str.slice(0, 8))
+        .str.to_date("%Y%m%d", strict=False)
+    )
+
+    # Week dates as YYYYWwwD (day 1 when omitted); chrono checks the week
+    # number, but the last days of 9999-W52 fall in year 10000
+    week_text = (
+        pl.when(
+            expr.str.contains(
+                f"^{year}(?:-W[0-9]{{2}}(?:-[0-9])?|W[0-9]{{2}}(?:[0-9](?s:..)?)?)$"
+            )
+        )
+        .then(expr.str.replace_all("-", "", literal=True))
+        .str.slice(0, 8)
+        .str.pad_end(8, "1")
+    )
+    week_dates = (
+        pl.when(~week_text.is_in(["9999W526", "9999W527"]))
+        .then(week_text)
+        .str.to_date("%GW%V%u", strict=False)
+    )
+
+    return pl.coalesce(calendar, basic, week_dates)
@@ -0,0 +1,237 @@
+"""On-disk cache of SPA loss-tree responses keyed by query parameters."""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+from .cache_files import (
+    clear_entries,
+    evict_entries,
+    remove_entry,
+    touch_entry,
+    write_entry,
+)
+
+# Default upper bound for the cache folder (all entries together)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Lifetime of a response whose period is still open (or only just closed)
+DEFAULT_LIVE_TTL = 15 * 60
+
+# Days after `date max` before SPA data for a period is treated as final
+SETTLE_DAYS = 1
+
+
+def is_settled(day: datetime.date, today: datetime.date) -> bool:
+    """Return True once SPA data up to and including `day` is final."""
+    return day < today - datetime.timedelta(days=SETTLE_DAYS)
+
+
+class SPAQuery(NamedTuple):
+    """The parameters that identify a SPA loss-tree result."""
+
+    line: str
+    functional_location: str
+    date_min: datetime.date
+    date_max: datetime.date
+    shift: str
+
+
+def spa_query_from_url(url: str) -> SPAQuery | None:
+    """Return the normalized query of a `get_url_period_loss_tree` URL.
+
+    Case, surrounding blanks and parameter order do not matter. Returns None
+    for URLs without the loss-tree parameters (e.g. the development pages),
+    which are then never cached.
+    """
+    params = {
+        key.lower(): values[0].strip()
+        for key, values in parse_qs(urlsplit(url).query).items()
+    }
+    try:
+        date_min = datetime.date.fromisoformat(params["db_segmentdatemin"])
+        date_max = datetime.date.fromisoformat(params["db_segmentdatemax"])
+        line = params["db_line"].upper()
+        functional_location = params["db_functionallocation"].upper()
+    except (KeyError, ValueError):
+        return None
+    shift_start = params.get("db_shiftstart", "")
+    shift_end = params.get("db_shiftend", "")
+    shift = shift_start if shift_start == shift_end else f"{shift_start}-{shift_end}"
+    return SPAQuery(line, functional_location, date_min, date_max, shift)
+
+
+class SPAResponseCache:
+    """Store raw SPA pages as gzip files keyed by their `SPAQuery`.
+
+    A page for a period that ended more than `SETTLE_DAYS` ago is written as
+    a *final* entry and reused forever (SPA does not change closed periods).
+    Any other page is a *live* entry that expires `live_ttl` seconds after it
+    was fetched; once its period has settled the next fetch replaces it with
+    a final one.
+
+    Eviction is least-recently-used by file mtime (refreshed on every hit of
+    a final entry) and keeps the folder below `max_bytes`.
+    """
+
+    FINAL = ".final.html.gz"
+    LIVE = ".live.html.gz"
+
+    def __init__(
+        self,
+        folder: str | os.PathLike,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        live_ttl: float = DEFAULT_LIVE_TTL,
+        clock: Callable[[], float] = time.time,
+        today: Callable[[], datetime.date] = datetime.date.today,
+    ) -> None:
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self._clock = clock
+        self._today = today
+
+    def is_final(self, query: SPAQuery) -> bool:
+        """Return True if `query`'s period is closed and settled."""
+        return is_settled(query.date_max, self._today())
+
+    def _entry_stem(self, query: SPAQuery) -> str:
+        return hashlib.sha1(repr(tuple(query)).encode("utf-8")).hexdigest()[:20]
+
+    def get(self, query: SPAQuery) -> str | None:
+        """Return the cached page for `query`, or None on a miss or expiry."""
+        stem = self._entry_stem(query)
+        final = self.folder / f"{stem}{self.FINAL}"
+        live = self.folder / f"{stem}{self.LIVE}"
+        try:
+            if final.exists():
+                entry = final
+            elif live.exists() and self._clock() - live.stat().st_mtime < self.live_ttl:
+                entry = live
+            else:
+                return None
+            html = gzip.decompress(entry.read_bytes()).decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError, gzip.BadGzipFile):
+            # Missing, partial or corrupt entry: let the caller re-fetch
+            return None
+        if entry is final:
+            touch_entry(entry)
+        return html
+
+    def put(self, query: SPAQuery, html: str) -> None:
+        """Store the page fetched for `query` as a final or live entry."""
+        stem = self._entry_stem(query)
+        suffix = self.FINAL if self.is_final(query) else self.LIVE
+        entry = self.folder / f"{stem}{suffix}"
+        data = gzip.compress(html.encode("utf-8"), compresslevel=6)
+        if not write_entry(entry, lambda tmp: tmp.write_bytes(data)):
+            return
+        if suffix == self.FINAL:
+            remove_entry(self.folder / f"{stem}{self.LIVE}")
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries until the folder fits `max_bytes`."""
+        evict_entries(self.folder, "*.html.gz", self.max_bytes)
+
+    def clear(self) -> None:
+        """Remove every entry in the cache folder."""
+        clear_entries(self.folder, "*.html.gz")
+
+
+class NetProductionDayCache:
+    """Remember SPA net production per line, functional location, shift and day.
+
+    Each (line, functional location, shift) has one small JSON file mapping
+    ISO dates to ``[value, final, fetched_at]``, so any date range can be
+    summed from the days already known. Settled days (see `SETTLE_DAYS`)
+    are final; the others expire `live_ttl` seconds after they were fetched.
+    """
+
+    SUFFIX = ".days.json"
+
+    def __init__(
+        self,
+        folder: str | os.PathLike,
+        live_ttl: float = DEFAULT_LIVE_TTL,
+        clock: Callable[[], float] = time.time,
+        today: Callable[[], datetime.date] = datetime.date.today,
+    ) -> None:
+        self.folder = Path(folder)
+        self.live_ttl = live_ttl
+        self._clock = clock
+        self._today = today
+        self._lock = threading.Lock()
+
+    def _entry_path(self, line: str, functional_location: str, shift: str) -> Path:
+        key = repr((line.upper(), functional_location.upper(), shift))
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+        return self.folder / f"{digest}{self.SUFFIX}"
+
+    def _load(self, entry: Path) -> dict:
+        try:
+            return json.loads(entry.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get_days(
+        self,
+        line: str,
+        functional_location: str,
+        shift: str,
+        days: Iterable[datetime.date],
+    ) -> dict[datetime.date, float]:
+        """Return the known, unexpired values among `days`."""
+        with self._lock:
+            known = self._load(self._entry_path(line, functional_location, shift))
+        now = self._clock()
+        found = {}
+        for day in days:
+            item = known.get(day.isoformat())
+            if item is None:
+                continue
+            value, final, fetched_at = item
+            if final or now - fetched_at < self.live_ttl:
+                found[day] = value
+        return found
+
+    def put_days(
+        self,
+        line: str,
+        functional_location: str,
+        shift: str,
+        values: dict[datetime.date, float],
+        provisional: Iterable[datetime.date] = (),
+    ) -> None:
+        """Merge freshly fetched day values into the stored ones.
+
+        Days in `provisional` are never stored as final, even once settled,
+        so they expire after `live_ttl` like recent days.
+        """
+        if not values:
+            return
+        entry = self._entry_path(line, functional_location, shift)
+        now = self._clock()
+        today = self._today()
+        provisional = set(provisional)
+        with self._lock:
+            known = self._load(entry)
+            for day, value in values.items():
+                final = is_settled(day, today) and day not in provisional
+                known[day.isoformat()] = [value, final, now]
+            text = json.dumps(known, sort_keys=True)
+            write_entry(entry, lambda tmp: tmp.write_text(text, encoding="utf-8"))
+
+    def clear(self) -> None:
+        """Remove every stored day."""
+        with self._lock:
+            clear_entries(self.folder, f"*{self.SUFFIX}")
@@ -1,10 +1,48 @@
+import re
+
 import polars as pl
 import httpx
-from bs4 import BeautifulSoup
+from html import unescape
+from html.entities import html5
+from html.parser import HTMLParser
 from typing import List, Union
 from tabulate import tabulate
 from datetime import datetime
 
+# Loss-tree tables with this many rows or fewer are layout/summary tables
+RELEVANT_MIN_ROWS = 20
+
+# Elements that never hold content (html.parser sends no end tag for them)
+_VOID_ELEMENTS = frozenset(
+    [
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+        "link", "menuitem", "meta", "param", "source", "track", "wbr",
+        "basefont", "bgsound", "command", "frame", "image", "isindex",
+        "nextid", "spacer",
+    ]
+)  # fmt: skip
+
+# Text inside these is code or annotation, never cell text
+_NON_TEXT_ELEMENTS = frozenset(["script", "style", "template", "rt", "rp"])
+
+_CELL_ELEMENTS = frozenset(["td", "th"])
+
+# Multipliers for the unit SPA prints after the net production value
+NET_PRODUCTION_UNITS = {"k": 1_000, "Mio": 1_000_000}
+
+# Text of the summary cell up to the next tag, e.g.
+# "Net production:&nbsp;36.47 Mio, &nbsp;Theo. prod. at target speed ..."
+_NET_PRODUCTION_RE = re.compile(r"Net production:[^<]*")
+
+# Title SPA puts above a loss-tree report, e.g.
+# "Loss tree for <b>Packer - Focke 550 (...) Period: 2025-01-01 to ...</b>"
+_LOSS_TREE_TITLE_RE = re.compile(r"Loss tree for\s*<b>[^<]*Period:")
+
+# Named references are accepted with or without the trailing semicolon
+_ENTITIES: dict = {}
+for _name, _char in sorted(html5.items()):
+    _ENTITIES.setdefault(_name.rstrip(";"), _char)
+
 
 def get_spa_url(
     env: str,
@@ -78,14 +116,180 @@ def _normalize_to_dataframe(
     return df_or_list
 
 
+class _TableExtractor(HTMLParser):
+    """Collect the text of every table cell in a single streaming pass.
+
+    Mirrors what ``BeautifulSoup(html, "html.parser")`` followed by
+    ``table.find_all("tr")`` / ``row.find_all(["td", "th"])`` /
+    ``cell.get_text(strip=True)`` returns, without building the tree:
+
+    - an end tag closes the most recent open element of that name (and
+      everything opened after it); unmatched end tags are ignored;
+    - rows and cells belong to every enclosing table/row, so nested tables
+      contribute their rows to the outer table too;
+    - a text segment runs between two tags and is stripped as a whole;
+      comments and script/style text are left out.
+
+    When a table closes its cell texts are gathered into one buffer per
+    column, padded with "" for short rows, and become the frame's columns.
+    Tables with `min_rows` non-empty rows or fewer are dropped at that
+    point, before any frame is built.
+    """
+
+    def __init__(self, min_rows: int = 0) -> None:
+        super().__init__(convert_charrefs=False)
+        self.min_rows = min_rows
+        # One slot per <table> in document order, filled when it closes
+        self.tables: list = []
+        # (tag name, table rows / row cells / cell texts, or None)
+        self._stack: list = []
+        self._open_count: dict = {}
+        self._tables: list = []
+        self._slots: list = []
+        self._rows: list = []
+        self._cells: list = []
+        self._non_text = 0
+        self._data: list = []
+
+    def _flush(self) -> None:
+        if not self._data:
+            return
+        text = "".join(self._data).strip()
+        self._data = []
+        if text and not self._non_text:
+            for cell in self._cells:
+                cell.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _VOID_ELEMENTS:
+            return
+        record = None
+        if tag == "table":
+            record = []
+            self._slots.append(len(self.tables))
+            self.tables.append(None)
+            self._tables.append(record)
+        elif tag == "tr":
+            record = []
+            for rows in self._tables:
+                rows.append(record)
+            self._rows.append(record)
+        elif tag in _CELL_ELEMENTS:
+            record = []
+            for cells in self._rows:
+                cells.append(record)
+            self._cells.append(record)
+        elif tag in _NON_TEXT_ELEMENTS:
+            self._non_text += 1
+        self._stack.append((tag, record))
+        self._open_count[tag] = self._open_count.get(tag, 0) + 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if not self._open_count.get(tag):
+            return
+        while True:
+            name, _ = self._stack[-1]
+            self._pop()
+            if name == tag:
+                break
+
+    def _pop(self) -> None:
+        tag, record = self._stack.pop()
+        self._open_count[tag] -= 1
+        if tag == "table":
+            self._tables.pop()
+            self._close_table(record)
+        elif tag == "tr":
+            self._rows.pop()
+        elif tag in _CELL_ELEMENTS:
+            self._cells.pop()
+        elif tag in _NON_TEXT_ELEMENTS:
+            self._non_text -= 1
+
+    def _close_table(self, rows: list) -> None:
+        # Append each non-empty row's cell texts to per-column buffers; a
+        # column first seen in a later row starts with "" for earlier rows
+        columns: list[list[str]] = []
+        height = 0
+        for row in rows:
+            texts = ["".join(cell) for cell in row]
+            if not any(texts):
+                continue
+            for j, text in enumerate(texts):
+                if j == len(columns):
+                    columns.append([""] * height)
+                columns[j].append(text)
+            for column in columns[len(texts) :]:
+                column.append("")
+            height += 1
+        index = self._slots.pop()
+        if height <= self.min_rows:
+            return
+        self.tables[index] = pl.DataFrame(
+            {str(j): column for j, column in enumerate(columns)}
+        )
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_entityref(self, name):
+        char = _ENTITIES.get(name)
+        self._data.append(char if char is not None else f"&{name}")
+
+    def handle_charref(self, name):
+        self._data.append(unescape(f"&#{name};"))
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith("CDATA["):
+            self._data.append(data[len("CDATA[") :])
+            self._flush()
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+
+def extract_tables(html: str, min_rows: int = 0) -> List[pl.DataFrame]:
+    """Return every ``<table>`` in `html` with more than `min_rows` rows.
+
+    Rows whose cells are all empty are not counted. Columns are named
+    ``"0"``, ``"1"``, ... and short rows are padded with ``""``.
+    """
+    parser = _TableExtractor(min_rows=min_rows)
+    parser.feed(html)
+    parser.close()
+    return [t for t in parser.tables if isinstance(t, pl.DataFrame)]
+
+
 def scrape_tables_to_polars_numeric_headers(
-    url: str = None, html: str = None
+    url: str = None, html: str = None, min_rows: int = 0
 ) -> List[pl.DataFrame]:
     """
     Scraping semua <table> dari URL atau HTML string,
     lalu mengubahnya menjadi list of Polars DataFrame
     dengan header kolom = 0, 1, 2, 3 ...
     Contoh: kolom pertama → 0, kolom kedua → 1, dst.
+
+    Tabel dengan jumlah baris <= `min_rows` langsung dilewati.
     """
     # Ambil HTML
     if html is None:
@@ -109,47 +313,7 @@ def scrape_tables_to_polars_numeric_headers(
     else:
         html_content = html
 
-    soup = BeautifulSoup(html_content, "html.parser")
-    tables = soup.find_all("table")
-
-    if not tables:
-        return []
-
-    list_dfs = []
-
-    for table in tables:
-        # Extract data using list comprehension for efficiency
-        data = [
-            [cell.get_text(strip=True) for cell in row.find_all(["td", "th"])]
-            for row in table.find_all("tr")
-        ]
-        # Filter out empty rows
-        data = [row for row in data if row and not all(c == "" for c in row)]
-
-        if not data:
-            continue
-
-        # Determine max columns
-        max_cols = max(len(row) for row in data)
-
-        # Normalize rows to same length using list comprehension
-        normalized_data = [
-            (
-                row + [""] * (max_cols - len(row))
-                if len(row) < max_cols
-                else row[:max_cols]
-            )
-            for row in data
-        ]
-
-        # Create headers
-        headers = [str(j) for j in range(max_cols)]
-
-        # Create Polars DataFrame
-        df = pl.DataFrame(normalized_data, schema=headers, orient="row")
-        list_dfs.append(df)
-
-    return list_dfs
+    return extract_tables(html_content, min_rows=min_rows)
 
 
 def get_relevant_tables(url: str = None, html: str = None) -> pl.DataFrame:
@@ -157,11 +321,10 @@ def get_relevant_tables(url: str = None, html: str = None) -> pl.DataFrame:
     Fungsi tambahan untuk mendapatkan tabel yang relevan berdasarkan kriteria tertentu.
     Misalnya, hanya mengembalikan tabel dengan jumlah baris lebih dari 20.
     """
-    all_tables = scrape_tables_to_polars_numeric_headers(url=url, html=html)
-    # Collect matching tables into a real list (don't return a generator) and
-    # ensure we return a Polars DataFrame (concat multiple tables) or an
-    # empty DataFrame when none were found.
-    relevant = [t for t in all_tables if t.height > 20]
+    # Small tables are skipped by the extractor before a frame is built
+    relevant = scrape_tables_to_polars_numeric_headers(
+        url=url, html=html, min_rows=RELEVANT_MIN_ROWS
+    )
 
     if not relevant:
         # return an empty DataFrame so callers can safely use .filter()
@@ -298,6 +461,62 @@ def split_dataframe(
     return chunks
 
 
+def parse_net_production_text(text: str) -> float:
+    """Convert ``"Net production: 36.47 Mio, ..."`` to a piece count."""
+    parts = text.split()
+    value = float(parts[2])
+    unit = parts[3].strip(",") if len(parts) > 3 else ""
+    return value * NET_PRODUCTION_UNITS.get(unit, 1)
+
+
+def is_loss_tree_result(html: str) -> bool:
+    """Return True if `html` holds loss-tree results (the "Time range" table).
+
+    Login, error and maintenance pages can come back with status 200 too;
+    they lack this table and must not be cached or parsed as results.
+    """
+    return "Time range" in html
+
+
+def is_empty_loss_tree(html: str) -> bool:
+    """Return True for a loss-tree report that has no results for its period.
+
+    Such a page carries the report title (with its period) but no "Time
+    range" table. Anything else without that table, such as a login or
+    error page, is not recognized as empty.
+    """
+    return not is_loss_tree_result(html) and bool(_LOSS_TREE_TITLE_RE.search(html))
+
+
+def find_net_production(html: str) -> float | None:
+    """Read the net production straight from the SPA loss-tree markup.
+
+    Only looks for the "Net production" cell that follows the "Time range"
+    summary header, so no table is parsed. Returns None when the page does
+    not have the expected layout; `net_production_from_tables` handles
+    those pages from the full `scrape_data_spa` output.
+    """
+    start = html.find("Time range")
+    if start < 0:
+        return None
+    match = _NET_PRODUCTION_RE.search(html, start)
+    if match is None:
+        return None
+    try:
+        return parse_net_production_text(unescape(match.group(0)))
+    except (IndexError, ValueError):
+        return None
+
+
+def net_production_from_tables(dfs: List[pl.DataFrame]) -> float | None:
+    """Return the net production of the "Time range" chunk of `scrape_data_spa`."""
+    net_product = None
+    for df in dfs:
+        if "Time range" in df.row(0):
+            net_product = parse_net_production_text(str(df.row(5)[11]))
+    return net_product
+
+
 def scrape_data_spa(url: str = None, html: str = None) -> List[pl.DataFrame]:
     """
     Scrape tables from the given URL or HTML string and return a list of cleaned
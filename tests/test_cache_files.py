@@ -0,0 +1,34 @@
+import os
+
+from src.utils.cache_files import clear_entries, evict_entries, write_entry
+
+
+def test_write_entry_replaces_atomically_and_cleans_up_on_failure(tmp_path):
+    entry = tmp_path / "cache" / "a.bin"
+    assert write_entry(entry, lambda tmp: tmp.write_bytes(b"old"))
+
+    def fail(tmp):
+        tmp.write_bytes(b"half")
+        raise OSError("disk full")
+
+    assert not write_entry(entry, fail)
+    assert entry.read_bytes() == b"old"
+    assert [p.name for p in entry.parent.iterdir()] == ["a.bin"]
+
+
+def test_evict_entries_drops_least_recently_used(tmp_path):
+    for i, name in enumerate(["old", "mid", "new"]):
+        entry = tmp_path / f"{name}.bin"
+        entry.write_bytes(b"x" * 10)
+        os.utime(entry, (1_000_000 + i, 1_000_000 + i))
+    (tmp_path / "other.txt").write_bytes(b"x" * 100)
+
+    evict_entries(tmp_path, "*.bin", max_bytes=20)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "mid.bin",
+        "new.bin",
+        "other.txt",
+    ]
+
+    clear_entries(tmp_path, "*.bin")
+    assert [p.name for p in tmp_path.iterdir()] == ["other.txt"]
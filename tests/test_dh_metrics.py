@@ -0,0 +1,98 @@
+import polars as pl
+
+from src.services.dh_data_service import (
+    get_data_dh_detail_high,
+    get_data_dh_detail_open,
+    get_data_dh_metrics,
+)
+
+
+def _frame():
+    return pl.DataFrame(
+        {
+            "NUMBER": ["1", "2", "3", "4", "5"],
+            "STATUS": ["OPEN", "CLOSED", "CLOSED", "OPEN", "CLOSED"],
+            "WORK CENTER TYPE": [
+                "Maker 21",
+                "Maker 21",
+                "Packer 21",
+                "Packer 21",
+                "Packer 21",
+            ],
+            "DEFECT TYPES": [
+                "SOURCE_OF_CONTAMINATION",
+                "MINOR|SOURCE_OF_CONTAMINATION",
+                "MINOR",
+                None,
+                "LACK_OF_BASIC_CONDITIONS",
+            ],
+            "DEFECT COUNTERMEASURES": ["cm", None, "", "cm", None],
+            "PRIORITY": ["HIGH", "LOW", "HIGH", "HIGH", "LOW"],
+            "DESCRIPTION": ["a", "b", "c", "d", "e"],
+            "FOUND DURING": ["CIL", "DH", "CIL", "CIL", "DH"],
+            "INSPECTION CATEGORIES": [
+                "Fasteners",
+                "Bearing",
+                "GluingSystems",
+                None,
+                "Fasteners",
+            ],
+        }
+    )
+
+
+def test_metrics_sections():
+    metrics = get_data_dh_metrics(_frame())
+
+    assert metrics["DH COMPONENT"] == {
+        "FOUND": 3,
+        "  - Maker 21": 1,
+        "  - Packer 21": 2,
+        "FIX": 2,
+    }
+    assert metrics["DH FOUND"] == {
+        "FOUND": 5,
+        "  - Maker 21": 2,
+        "  - Packer 21": 3,
+        "HIGH": 3,
+    }
+    # an empty countermeasure does not count towards "% HIGH CM"
+    assert metrics["DH OPEN"]["DH OPEN"] == 2
+    assert round(metrics["DH OPEN"]["% HIGH CM"], 4) == round(100 * 2 / 3, 4)
+    assert metrics["DH SOC"] == {"FOUND": 2, "FIX": 1}
+
+
+def test_metrics_empty_frame():
+    metrics = get_data_dh_metrics(_frame().head(0))
+
+    assert metrics["DH FOUND"] == {"FOUND": 0, "HIGH": 0}
+    assert metrics["DH OPEN"] == {"DH OPEN": 0, "% HIGH CM": 0}
+
+
+def test_detail_lines():
+    df = _frame().with_columns(
+        pl.Series("WORK CENTER TYPE", ["Maker 21", "Maker 21", "Packer", None, "P 26"])
+    )
+
+    open_lines = get_data_dh_detail_open(df)["DH OPEN"]
+    high_lines = get_data_dh_detail_high(df)["DH HIGH"]
+
+    assert open_lines.to_list() == ["1 | M21 | a", "4 | N | d"]
+    assert high_lines.to_list() == [
+        "1 | M21 | a \n- Status: OPEN \n- Countermeasures: cm",
+        "3 | P | c \n- Status: CLOSED \n- Countermeasures: ",
+        "4 | N | d \n- Status: OPEN \n- Countermeasures: cm",
+    ]
+
+
+def test_detail_work_center_splits_on_any_whitespace():
+    df = _frame().with_columns(
+        pl.Series(
+            "WORK CENTER TYPE",
+            ["Maker  21", "Maker 21", "Packer\t21", " Maker \n 26 ", "P 26"],
+        )
+    )
+
+    open_lines = get_data_dh_detail_open(df)["DH OPEN"]
+
+    assert open_lines.to_list() == ["1 | M21 | a", "4 | M26 | d"]
@@ -1,6 +1,11 @@
+from pathlib import Path
+
 import polars as pl
 
-from src.services.dh_data_service import read_data_dh
+from src.services.dh_data_service import read_data_dh, read_data_dh_many
+from src.utils.frame_cache import FrameCache
+
+EXPORTS = sorted(str(p) for p in Path("assets").glob("DH_*.csv"))
 
 
 def _write_csv(path, rows, header):
@@ -45,3 +50,79 @@ def test_read_multiple_and_concat(tmp_path):
         "REPORTED AT",
     ]:
         assert col in df_all.columns
+
+
+def test_read_many_dedupes_overlap_newest_wins(tmp_path):
+    header = "NUMBER,STATUS,WORK CENTER TYPE,DEFECT TYPES,DEFECT COUNTERMEASURES,PRIORITY,DESCRIPTION,FOUND DURING,INSPECTION CATEGORIES,REPORTED AT"
+
+    older = [
+        "DH1,OPEN,Maker 21,,,HIGH,desc 1,CIL,Fasteners,01/10/2025 08:00",
+        "DH2,OPEN,Packer 21,,,LOW,desc 2,DH,Fasteners,02/10/2025 09:00",
+    ]
+    newer = [
+        "DH3,OPEN,Maker 21,,,LOW,desc 3,CIL,Fasteners,07/10/2025 10:00",
+        "DH1,CLOSED,Maker 21,,fixed,HIGH,desc 1,CIL,Fasteners,01/10/2025 08:00",
+    ]
+
+    f_old = tmp_path / "DH_2025-10-01_12-00_Packer21_Maker21.csv"
+    f_new = tmp_path / "DH_2025-10-07_16-38_Packer21_Maker21.csv"
+    _write_csv(f_old, older, header)
+    _write_csv(f_new, newer, header)
+
+    # argument order must not matter, the export time decides
+    df = read_data_dh_many([str(f_new), str(f_old)])
+    again = read_data_dh_many([str(f_old), str(f_new)])
+
+    assert df.equals(again)
+    # merged records are ordered newest REPORTED AT first
+    assert df["NUMBER"].to_list() == ["DH3", "DH2", "DH1"]
+    assert df.filter(pl.col("NUMBER") == "DH1")["STATUS"].item() == "CLOSED"
+
+
+def test_read_many_enum_columns_fall_back_to_string(tmp_path):
+    header = "NUMBER,STATUS,WORK CENTER TYPE,PRIORITY,DESCRIPTION,REPORTED AT"
+    f1 = tmp_path / "DH_2025-10-01_12-00_x.csv"
+    f2 = tmp_path / "DH_2025-10-02_12-00_x.csv"
+    _write_csv(f1, ["DH1,OPEN,Maker 21,HIGH,a,01/10/2025 08:00"], header)
+    _write_csv(f2, ["DH2,ON HOLD,Maker 21,LOW,b,02/10/2025 08:00"], header)
+
+    assert isinstance(read_data_dh(str(f1)).schema["STATUS"], pl.Enum)
+
+    df = read_data_dh_many([str(f1), str(f2)])
+
+    # an unknown STATUS keeps the column as text, PRIORITY still fits its domain
+    assert df.schema["STATUS"] == pl.String
+    assert isinstance(df.schema["PRIORITY"], pl.Enum)
+    assert df.filter(pl.col("STATUS") == "OPEN")["NUMBER"].to_list() == ["DH1"]
+
+
+def test_read_many_caches_bundled_exports(tmp_path):
+    cache = FrameCache(tmp_path)
+
+    # the 877-row export is collected in several chunks with Enum columns
+    first = read_data_dh_many(EXPORTS, cache=cache)
+    again = read_data_dh_many(EXPORTS, cache=cache)
+
+    assert len(list(tmp_path.glob("*.arrow"))) == len(EXPORTS)
+    assert first.equals(again)
+    assert first.equals(read_data_dh_many(EXPORTS))
+
+
+def test_read_many_fills_cache_in_read_data_dh_order(tmp_path):
+    header = "NUMBER,STATUS,WORK CENTER TYPE,PRIORITY,DESCRIPTION,REPORTED AT"
+    export = tmp_path / "DH_2025-10-07_16-38_x.csv"
+    _write_csv(
+        export,
+        [
+            "DH1,OPEN,Maker 21,HIGH,a,01/10/2025 08:00",
+            "DH2,OPEN,Maker 21,HIGH,b,02/10/2025 08:00",
+        ],
+        header,
+    )
+    cache = FrameCache(tmp_path / "cache")
+
+    read_data_dh_many([str(export)], cache=cache)
+    cached = read_data_dh(str(export), cache=cache)
+
+    assert cached["NUMBER"].to_list() == ["DH2", "DH1"]
+    assert cached.equals(read_data_dh(str(export)))
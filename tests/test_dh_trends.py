@@ -0,0 +1,74 @@
+import datetime
+
+import polars as pl
+
+from src.services.dh_data_service import get_dh_trend_rollups
+from src.services.dh_time_index import DHTimeIndex
+
+
+def _frame():
+    return pl.DataFrame(
+        {
+            "NUMBER": ["1", "2", "3", "4", "5"],
+            "STATUS": ["CLOSED", "OPEN", "CLOSED", "CLOSED", "OPEN"],
+            "WORK CENTER TYPE": [
+                "Maker 21",
+                "Maker 21",
+                "Packer 21",
+                "Maker 21",
+                "Maker 21",
+            ],
+            "DEFECT TYPES": [
+                "SOURCE_OF_CONTAMINATION",
+                "MINOR",
+                None,
+                "MINOR",
+                "MINOR",
+            ],
+            "PRIORITY": ["HIGH", "LOW", "LOW", "LOW", "HIGH"],
+            "FOUND DURING": ["CIL", "DH", "CIL", "CIL", "CIL"],
+            "REPORTED AT": [
+                datetime.datetime(2025, 9, 29, 8),  # Monday, week 40
+                datetime.datetime(2025, 10, 5, 23),  # Sunday, week 40
+                datetime.datetime(2025, 10, 1, 9),
+                datetime.datetime(2025, 10, 6, 7),  # Monday, week 41
+                None,
+            ],
+        }
+    )
+
+
+def test_weekly_rollup_per_work_center():
+    weekly = get_dh_trend_rollups(_frame())["Weekly"]
+
+    assert weekly.rows() == [
+        (datetime.date(2025, 9, 29), "Maker 21", 2, 1, 1, 1, 1),
+        (datetime.date(2025, 9, 29), "Packer 21", 1, 1, 1, 0, 0),
+        (datetime.date(2025, 10, 6), "Maker 21", 1, 1, 1, 0, 0),
+    ]
+
+
+def test_monthly_rollup_skips_missing_dates():
+    monthly = get_dh_trend_rollups(_frame())["Monthly"]
+
+    assert monthly["PERIOD"].to_list() == [
+        datetime.date(2025, 9, 1),
+        datetime.date(2025, 10, 1),
+        datetime.date(2025, 10, 1),
+    ]
+    assert monthly["FOUND"].sum() == 4
+
+
+def test_time_index_windows():
+    index = DHTimeIndex(_frame())
+
+    assert index.week(2025, 40)["NUMBER"].to_list() == ["2", "3", "1"]
+    assert index.week(2025, 41)["NUMBER"].to_list() == ["4"]
+    assert index.month(2025, 9)["NUMBER"].to_list() == ["1"]
+    assert index.month(2025, 12).is_empty()
+    # shift 3 of Oct 5th runs until 06:00 on the 6th, 07:00 is shift 1
+    assert index.shift(datetime.date(2025, 10, 5), 3)["NUMBER"].to_list() == ["2"]
+    assert index.shift(datetime.date(2025, 10, 6), 1)["NUMBER"].to_list() == ["4"]
+    assert index.between(
+        datetime.datetime(2025, 10, 1, 9), datetime.datetime(2025, 10, 5, 23)
+    )["NUMBER"].to_list() == ["3"]
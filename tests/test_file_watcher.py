@@ -0,0 +1,51 @@
+import os
+
+from src.utils.file_watcher import PollingFileWatcher
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _save(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_reports_a_burst_of_saves_once_after_debounce(tmp_path):
+    book = tmp_path / "26-MPS board Print.xlsx"
+    _save(book, "v1", 1_000)
+    clock = _Clock()
+    watcher = PollingFileWatcher([book], debounce=3, clock=clock)
+
+    assert watcher.poll() == []
+    _save(book, "v2", 2_000)
+    assert watcher.poll() == []
+    clock.now = 2
+    _save(book, "v3-longer", 3_000)  # still saving: restarts the quiet period
+    assert watcher.poll() == []
+    clock.now = 4
+    assert watcher.poll() == []
+    clock.now = 5
+    assert watcher.poll() == [str(book)]
+    clock.now = 10
+    assert watcher.poll() == []
+
+
+def test_ignores_lock_files_and_missing_files(tmp_path):
+    book = tmp_path / "21-MPS board Print.xlsx"
+    lock = tmp_path / "~$21-MPS board Print.xlsx"
+    _save(book, "v1", 1_000)
+    _save(lock, "owner", 1_000)
+    clock = _Clock()
+    watcher = PollingFileWatcher([book, lock], debounce=1, clock=clock)
+
+    assert watcher.paths == [str(book)]
+    book.unlink()  # mid-save rename
+    watcher.poll()
+    clock.now = 5
+    assert watcher.poll() == []
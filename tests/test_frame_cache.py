@@ -0,0 +1,115 @@
+import os
+
+import polars as pl
+
+from src.utils.frame_cache import FrameCache, FrameLRU, frame_content_hash
+
+
+def _touch(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_get_or_load_parses_once(tmp_path):
+    src = tmp_path / "a.csv"
+    _touch(src, "x\n1\n2\n", 1_000_000)
+    cache = FrameCache(tmp_path / "cache")
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        return pl.read_csv(p)
+
+    first = cache.get_or_load(src, loader)
+    second = cache.get_or_load(src, loader)
+
+    assert len(calls) == 1
+    assert first.equals(second)
+
+
+def test_changed_file_or_schema_version_misses(tmp_path):
+    src = tmp_path / "a.csv"
+    _touch(src, "x\n1\n", 1_000_000)
+    cache = FrameCache(tmp_path / "cache")
+    cache.put(src, pl.DataFrame({"x": [1]}))
+    assert cache.get(src) is not None
+
+    assert FrameCache(tmp_path / "cache", schema_version=2).get(src) is None
+
+    _touch(src, "x\n1\n2\n", 2_000_000)
+    assert cache.get(src) is None
+    # the stale entry for the same source is replaced, not accumulated
+    cache.put(src, pl.DataFrame({"x": [1, 2]}))
+    assert len(list((tmp_path / "cache").glob("*.arrow"))) == 1
+
+
+def test_file_saved_during_load_is_not_cached(tmp_path):
+    src = tmp_path / "a.csv"
+    _touch(src, "x\n1\n", 1_000_000)
+
+    def loader(p):
+        df = pl.read_csv(p)
+        _touch(src, "x\n1\n2\n", 2_000_000)
+        return df
+
+    for cache in (FrameCache(tmp_path / "cache"), FrameLRU()):
+        _touch(src, "x\n1\n", 1_000_000)
+        assert cache.get_or_load(src, loader).height == 1
+        assert cache.get(src) is None
+        assert cache.get_or_load(src, pl.read_csv).height == 2
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = FrameCache(tmp_path / "cache")
+    frame = pl.DataFrame({"x": list(range(1000))})
+    sources = []
+    for i in range(3):
+        src = tmp_path / f"{i}.csv"
+        _touch(src, "x\n", 1_000_000)
+        cache.put(src, frame)
+        sources.append(src)
+    entries = sorted((tmp_path / "cache").glob("*.arrow"))
+    for age, entry in enumerate(entries):
+        os.utime(entry, (1_000 + age, 1_000 + age))
+    # touch the oldest entry so it becomes the most recently used
+    oldest = min(entries, key=lambda p: p.stat().st_mtime)
+    os.utime(oldest, (5_000, 5_000))
+
+    cache.max_bytes = oldest.stat().st_size
+    cache.evict()
+
+    remaining = list((tmp_path / "cache").glob("*.arrow"))
+    assert remaining == [oldest]
+
+
+def test_frame_lru_reloads_changed_file_and_bounds_size(tmp_path):
+    lru = FrameLRU(maxsize=2)
+    src = tmp_path / "a.csv"
+    _touch(src, "x\n1\n", 1_000_000)
+    calls = []
+
+    def loader(p):
+        calls.append(p)
+        return pl.read_csv(p)
+
+    first = lru.get_or_load(src, loader, "Tracking")
+    assert lru.get_or_load(src, loader, "Tracking") is first
+    assert lru.get(src, "Other") is None
+
+    _touch(src, "x\n1\n2\n", 2_000_000)
+    assert lru.get_or_load(src, loader, "Tracking").height == 2
+    assert len(calls) == 2
+
+    for i in range(3):
+        other = tmp_path / f"{i}.csv"
+        _touch(other, "x\n", 1_000_000)
+        lru.put(other, pl.DataFrame({"x": []}))
+    assert lru.get(src, "Tracking") is None
+
+
+def test_frame_content_hash_tracks_values_and_order():
+    df = pl.DataFrame({"x": [1, 2], "y": ["a", None]})
+
+    assert frame_content_hash(df) == frame_content_hash(df.clone())
+    assert frame_content_hash(df) != frame_content_hash(df.reverse())
+    assert frame_content_hash(df) != frame_content_hash(df.rename({"y": "z"}))
@@ -0,0 +1,25 @@
+import datetime
+
+import polars as pl
+
+from src.utils.helpers import parse_datetime_formats
+
+
+def test_parse_datetime_formats_first_match_wins():
+    raw = pl.Series(
+        "v", ["07/10/2025 09:53", "2025-11-01 08:00:00", " 25/01/2025 ", "n/a", None]
+    )
+
+    out = raw.to_frame().select(
+        parse_datetime_formats(
+            pl.col("v"), ("%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y")
+        )
+    )["v"]
+
+    assert out.to_list() == [
+        datetime.datetime(2025, 10, 7, 9, 53),
+        datetime.datetime(2025, 11, 1, 8, 0),
+        datetime.datetime(2025, 1, 25),
+        None,
+        None,
+    ]
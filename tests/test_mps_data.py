@@ -0,0 +1,168 @@
+import datetime
+from pathlib import Path
+
+import polars as pl
+
+from src.services import mps_data_service as mps
+from src.services.mps_index import MPSIndex
+
+WORKBOOK = Path("assets/21-MPS board Print.xlsx")
+
+
+def test_dynamic_header_reads_only_requested_columns():
+    df = mps.read_excel_with_dynamic_header(
+        str(WORKBOOK), "Tracking", columns=mps.MPS_COLUMNS
+    )
+    assert df.columns == mps.MPS_COLUMNS
+    assert df.schema == {c: pl.String for c in mps.MPS_COLUMNS}
+    assert df["DATE"][0] == "2024-12-01 00:00:00"
+
+
+def test_read_data_mps_keeps_optional_metric_columns():
+    df = mps.read_data_mps(str(WORKBOOK), "Tracking")
+
+    assert df.height == 213
+    assert df.columns == [*mps.MPS_COLUMNS, *mps.MPS_METRIC_COLUMNS]
+    assert df.schema["Plan exe (min)"] == pl.Float64
+    assert df["Plan exe (min)"].drop_nulls().len() == 42
+
+
+def test_normalize_date_column_matches_python_parser():
+    raw = [
+        "2024-12-01",
+        "2024-12-1",
+        "20241201",
+        "2024-W49-7",
+        "2024-12-01 00:00:00",
+        "2024-12-01t06:30:00",
+        "2024-12-01 00:00:60",
+        "2024-12-01T06:30:00",
+        "01/02/2024",
+        " 13-02-2024 ",
+        "2024/1/5",
+        "12/31/2024",
+        "02-28-2024",
+        "31/02/2024",
+        "01/02/24",
+        "0000-01-01",
+        "n/a",
+        "",
+        None,
+    ]
+
+    out = mps.normalize_date_column(pl.Series("DATE", raw))
+
+    assert out.dtype == pl.Date
+    assert out.to_list() == mps.convert_date_values(raw)
+
+
+def test_normalize_date_column_passes_native_values_through():
+    stamps = pl.Series("DATE", [datetime.datetime(2025, 3, 22, 14, 0), None])
+
+    out = mps.normalize_date_column(stamps)
+
+    assert out.to_list() == [datetime.date(2025, 3, 22), None]
+
+
+def test_owner_and_equipment_cleaning():
+    raw = pl.DataFrame(
+        {
+            "Owner": [
+                "technician maker shift 1",
+                "Riyan, rohadi",
+                "ELECTRICIAN Shift 2",
+                None,
+            ],
+            "Equipment": ["08. Focke 751", " VE ", "1.2.3", None],
+        }
+    )
+
+    out = raw.with_columns(mps.mps_owner_expr(), mps.mps_equipment_expr())
+
+    assert out["Owner"].to_list() == [
+        "Technician maker",
+        "Riyan, rohadi",
+        "Electrician",
+        None,
+    ]
+    assert out["Equipment"].to_list() == ["Focke 751", "VE", "2", None]
+
+
+def test_mps_index_looks_up_iso_weeks_and_shifts():
+    df = pl.DataFrame(
+        {
+            "DATE": [
+                datetime.date(2025, 1, 7),
+                datetime.date(2024, 12, 30),
+                datetime.date(2025, 1, 7),
+                datetime.date(2025, 1, 5),
+            ],
+            "Shift": pl.Series([2, 1, 1, 1], dtype=pl.Int32),
+            "Owner": ["B", "A", "C", "D"],
+            "Equipment": ["VE", "VE", "MAX", "VE"],
+            "Plan exe (min)": [30.0, 60.0, None, 20.0],
+            "Actual (min)": [45.0, 30.0, 10.0, None],
+        }
+    )
+
+    index = MPSIndex(df)
+
+    assert index.weeks() == [(2025, 1), (2025, 2)]
+    # 30 Dec 2024 is in ISO week 1 of 2025; rows come back sorted
+    assert index.week(2025, 1)["Owner"].to_list() == ["A", "D"]
+    assert index.week(2025, 2)["Owner"].to_list() == ["C", "B"]
+    assert index.date_and_shift("2025-01-07", 2)["Owner"].to_list() == ["B"]
+    assert index.week(2025, 53).is_empty()
+    assert index.week(2025, 53).columns == df.columns
+    # only "A" has both plan and actual in week 1; "D" has no actual
+    week1 = index.adherence(2025, 1)
+    assert week1.select("Owner", "Adherence", "Overrun (min)").rows() == [
+        ("A", 0.5, 0.0),
+        ("D", None, 0.0),
+    ]
+    assert (
+        index.adherence(2025, 2)
+        .filter(pl.col("Owner") == "B")
+        .row(0, named=True)["Overrun (min)"]
+        == 15.0
+    )
+    assert index.adherence(2025, 53).is_empty()
+
+
+def test_week_reports_render_each_shift_and_export(tmp_path):
+    df = pl.DataFrame(
+        {
+            "DATE": [
+                datetime.date(2025, 1, 7),
+                datetime.date(2025, 1, 6),
+                datetime.date(2025, 1, 7),
+                None,
+            ],
+            "Shift": pl.Series([1, 2, 1, None], dtype=pl.Int32),
+            "Owner": ["Technician", "Electrician", "Riyan", "Nobody"],
+            "Equipment": ["VE", "Focke 751", "MAX", "VE"],
+            "Activity Description": ["Replace belt", "Check motor", "Clean", "-"],
+        }
+    )
+
+    reports = mps.create_week_reports(df)
+
+    assert list(reports) == [
+        (datetime.date(2025, 1, 6), 2),
+        (datetime.date(2025, 1, 7), 1),
+    ]
+    assert reports[(datetime.date(2025, 1, 7), 1)] == mps.create_report_text(
+        df.filter(pl.col("Owner").is_in(["Technician", "Riyan"]))
+    )
+
+    written = mps.export_reports(reports, tmp_path)
+
+    assert sorted(p.name for p in written) == [
+        "MPS_2025-01-06_Shift2.png",
+        "MPS_2025-01-06_Shift2.txt",
+        "MPS_2025-01-07_Shift1.png",
+        "MPS_2025-01-07_Shift1.txt",
+    ]
+    assert (tmp_path / "MPS_2025-01-06_Shift2.txt").read_text(
+        encoding="utf-8"
+    ) == reports[(datetime.date(2025, 1, 6), 2)]
@@ -0,0 +1,218 @@
+import asyncio
+import datetime
+import time
+
+from src.services import rnm_data_service
+import pytest
+
+from src.utils.spa_cache import (
+    NetProductionDayCache,
+    SPAQuery,
+    SPAResponseCache,
+    spa_query_from_url,
+)
+from src.utils.spa_processor import get_url_period_loss_tree
+
+TODAY = datetime.date(2025, 3, 12)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+def _query(date_min, date_max):
+    return SPAQuery("ID01-SE-CP-L021", "ID01-SE-CP-L021-PACK", date_min, date_max, "")
+
+
+def test_query_from_url_normalizes_parameters(monkeypatch):
+    monkeypatch.setattr("src.utils.app_config.get_base_url", lambda: "http://spa/?")
+    url = get_url_period_loss_tree("21", "2025-03-03", "2025-03-09")
+    query = spa_query_from_url(url)
+
+    assert query == _query(datetime.date(2025, 3, 3), datetime.date(2025, 3, 9))
+    shuffled = (
+        "http://spa/db.aspx?db_SegmentDateMax=2025-03-09&db_ShiftEnd="
+        "&DB_LINE=id01-se-cp-l021&db_FunctionalLocation=ID01-SE-CP-L021-PACK"
+        "&db_SegmentDateMin= 2025-03-03&db_ShiftStart=&act=query"
+    )
+    assert spa_query_from_url(shuffled) == query
+    assert spa_query_from_url("http://127.0.0.1:5500/assets/spa/1.html") is None
+
+
+def test_closed_periods_are_final_and_open_ones_expire(tmp_path):
+    clock = _Clock()
+    cache = SPAResponseCache(tmp_path, live_ttl=60, clock=clock, today=lambda: TODAY)
+    closed = _query(datetime.date(2025, 3, 3), datetime.date(2025, 3, 9))
+    current = _query(datetime.date(2025, 3, 10), datetime.date(2025, 3, 16))
+
+    cache.put(closed, "<html>closed</html>")
+    cache.put(current, "<html>current</html>")
+    assert cache.get(current) == "<html>current</html>"
+
+    clock.now += 3600
+    assert cache.get(closed) == "<html>closed</html>"
+    assert cache.get(current) is None
+
+
+def test_eviction_keeps_folder_below_max_bytes(tmp_path):
+    cache = SPAResponseCache(tmp_path, max_bytes=1, today=lambda: TODAY)
+    query = _query(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31))
+
+    cache.put(query, "<html>January</html>")
+    assert cache.get(query) is None
+    assert list(tmp_path.glob("*.html.gz")) == []
+
+
+def test_fetch_spa_page_serves_cache_unless_refreshed(tmp_path, monkeypatch):
+    fetched = []
+
+    async def fake_fetch(url, username, password, verify_ssl=False, pool=None):
+        fetched.append(url)
+        if "2025-01-01" in url:
+            return "<html><form>Session expired, please sign in</form></html>"
+        return f"<td>Time range</td>{len(fetched)}"
+
+    monkeypatch.setattr(rnm_data_service, "fetch_rnm_data", fake_fetch)
+    cache = SPAResponseCache(tmp_path, today=lambda: TODAY)
+    url = (
+        "http://spa/db.aspx?db_Line=ID01-SE-CP-L021"
+        "&db_FunctionalLocation=ID01-SE-CP-L021-PACK"
+        "&db_SegmentDateMin=2025-02-01&db_SegmentDateMax=2025-02-28"
+    )
+
+    async def page(refresh=False):
+        return await rnm_data_service.fetch_spa_page(
+            url, "user", "secret", cache=cache, refresh=refresh
+        )
+
+    assert asyncio.run(page()) == "<td>Time range</td>1"
+    assert asyncio.run(page()) == "<td>Time range</td>1"
+    assert asyncio.run(page(refresh=True)) == "<td>Time range</td>2"
+    assert asyncio.run(page()) == "<td>Time range</td>2"
+    assert len(fetched) == 2
+
+    # a 200 page without loss-tree results (login, error) is never stored
+    url = url.replace("2025-02-01", "2025-01-01")
+    asyncio.run(page())
+    asyncio.run(page())
+    assert len(fetched) == 4
+    assert cache.get(spa_query_from_url(url)) is None
+
+
+def test_day_cache_keeps_settled_days_and_expires_recent_ones(tmp_path):
+    clock = _Clock()
+    cache = NetProductionDayCache(
+        tmp_path, live_ttl=60, clock=clock, today=lambda: TODAY
+    )
+    key = ("ID01-SE-CP-L021", "ID01-SE-CP-L021-PACK", "")
+    settled, recent = datetime.date(2025, 3, 10), datetime.date(2025, 3, 11)
+
+    cache.put_days(*key, {settled: 1_000.0, recent: 2_000.0})
+    assert cache.get_days(*key, [settled, recent]) == {
+        settled: 1_000.0,
+        recent: 2_000.0,
+    }
+    clock.now += 3600
+    assert cache.get_days(*key, [settled, recent]) == {settled: 1_000.0}
+    assert cache.get_days("ID01-SE-CP-L026", key[1], "", [settled]) == {}
+
+
+def test_range_is_summed_from_days_and_only_gaps_are_fetched(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.app_config.get_base_url", lambda: "http://spa/?")
+    fetched = []
+    failures = [datetime.date(2025, 3, 5)]
+    running = peak = 0
+
+    async def fake_net_production(url, *args, **kwargs):
+        nonlocal running, peak
+        day = spa_query_from_url(url).date_min
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if day in failures:
+            failures.remove(day)
+            raise ValueError("SPA timeout")
+        fetched.append(day)
+        return float(day.day)
+
+    monkeypatch.setattr(rnm_data_service, "get_spa_net_production", fake_net_production)
+    cache = NetProductionDayCache(tmp_path, today=lambda: TODAY)
+
+    def net_production(date_min, date_max):
+        return asyncio.run(
+            rnm_data_service.get_spa_net_production_for_days(
+                "21",
+                date_min,
+                date_max,
+                "user",
+                "secret",
+                cache=cache,
+                max_concurrency=2,
+            )
+        )
+
+    with pytest.raises(ValueError, match="SPA timeout"):
+        net_production(datetime.date(2025, 3, 3), datetime.date(2025, 3, 9))
+    assert peak == 2
+    fetched.clear()
+    assert net_production(datetime.date(2025, 3, 3), datetime.date(2025, 3, 9)) == sum(
+        range(3, 10)
+    )
+    assert fetched == [datetime.date(2025, 3, 5)]
+
+    fetched.clear()
+    assert net_production(datetime.date(2025, 3, 1), datetime.date(2025, 3, 4)) == 10
+    assert fetched == [datetime.date(2025, 3, 1), datetime.date(2025, 3, 2)]
+
+
+def test_days_after_today_and_days_without_data(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.utils.app_config.get_base_url", lambda: "http://spa/?")
+    requested = []
+    pages = {
+        "data": "<td>Time range</td><td>Net production: 1.5 k, 3 shifts</td>",
+        "empty": "Loss tree for <b>(ID01-SE-CP-L021-PACK) Period: 2025-03-10</b>",
+        "login": "<html><form>Session expired, please sign in</form></html>",
+    }
+    kinds = {10: "empty"}
+
+    async def fake_page(url, *args, **kwargs):
+        day = spa_query_from_url(url).date_min
+        requested.append(day)
+        return pages[kinds.get(day.day, "data")]
+
+    monkeypatch.setattr(rnm_data_service, "fetch_spa_page", fake_page)
+    clock = _Clock()
+    cache = NetProductionDayCache(
+        tmp_path, live_ttl=60, clock=clock, today=lambda: TODAY
+    )
+
+    def net_production(date_min, date_max):
+        return asyncio.run(
+            rnm_data_service.get_spa_net_production_for_days(
+                "21", date_min, date_max, "user", "secret", cache=cache, today=TODAY
+            )
+        )
+
+    # The 10th has an empty loss tree, the 13th and later are not asked
+    assert net_production(TODAY.replace(day=9), TODAY.replace(day=16)) == 4_500.0
+    assert sorted(requested) == [TODAY.replace(day=d) for d in (9, 10, 11, 12)]
+
+    # the defaulted 0 is never final, even though the 10th has settled
+    key = ("ID01-SE-CP-L021", "ID01-SE-CP-L021-PACK", "")
+    days = [TODAY.replace(day=9), TODAY.replace(day=10)]
+    clock.now += 3600
+    assert cache.get_days(*key, days) == {TODAY.replace(day=9): 1_500.0}
+
+    requested.clear()
+    assert net_production(TODAY.replace(day=13), TODAY.replace(day=16)) == 0.0
+    assert requested == []
+
+    # a page that is not a loss-tree report still fails the report
+    kinds[10] = "login"
+    with pytest.raises(ValueError, match="Net production not found"):
+        net_production(TODAY.replace(day=9), TODAY.replace(day=10))
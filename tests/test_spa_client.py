@@ -0,0 +1,59 @@
+import asyncio
+
+from src.services.spa_client import SPAClientPool
+
+
+def test_reuses_client_until_credentials_change():
+    async def run():
+        pool = SPAClientPool()
+        first = pool.client("PMI\\champion", "secret")
+        assert pool.client("PMI\\champion", "secret") is first
+        assert pool.client("PMI\\champion", "secret", verify_ssl=True) is not first
+
+        replaced = pool.client("PMI\\champion", "rotated")
+        assert replaced is not first
+        await pool.aclose()
+        await asyncio.sleep(0)
+        assert first.is_closed and replaced.is_closed
+
+    asyncio.run(run())
+
+
+def test_replaced_client_closes_after_its_running_requests():
+    async def run():
+        pool = SPAClientPool()
+        first = pool.client("PMI\\champion", "secret")
+        release = asyncio.Event()
+
+        async def slow_get(url):
+            await release.wait()
+            return url
+
+        first.get = slow_get
+        url = "http://spa/db.aspx"
+        request = asyncio.create_task(pool.get(url, "PMI\\champion", "secret"))
+        await asyncio.sleep(0)
+
+        pool.client("PMI\\champion", "rotated")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert not first.is_closed
+
+        release.set()
+        assert await request == url
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert first.is_closed
+        await pool.aclose()
+
+    asyncio.run(run())
+
+
+def test_drops_clients_from_a_finished_event_loop():
+    pool = SPAClientPool()
+
+    async def client():
+        return pool.client("PMI\\champion", "secret")
+
+    first = asyncio.run(client())
+    assert asyncio.run(client()) is not first
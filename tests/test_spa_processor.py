@@ -0,0 +1,66 @@
+import polars as pl
+
+import pytest
+
+from src.utils.spa_processor import (
+    extract_tables,
+    find_net_production,
+    get_relevant_tables,
+    net_production_from_tables,
+    scrape_data_spa,
+)
+
+PAGE = """
+<html><head><script>var cells = "<td>x</td>";</script></head><body>
+<table>
+  <tr><th> Line </th><th>Stops</th></tr>
+  <tr><td>A&nbsp;&amp; B</td><td> 1<br> 2 </td><td>extra</td></tr>
+  <tr><td></td><td>  </td></tr>
+  <tr><td>C<!-- hidden --></td><td>&#39;3&#39;</td>
+</table>
+<table><tr><td>outer</td><td>
+  <table><tr><td>inner</td></tr></table>
+</td></tr></table>
+</body></html>
+"""
+
+
+def test_extracts_cells_like_get_text_strip():
+    first, outer, inner = extract_tables(PAGE)
+
+    assert first.columns == ["0", "1", "2"]
+    assert first.rows() == [
+        ("Line", "Stops", ""),
+        ("A\xa0& B", "12", "extra"),
+        ("C", "'3'", ""),
+    ]
+    # Nested rows and cells also belong to the enclosing table/row
+    assert outer.rows() == [("outer", "inner", "inner"), ("inner", "", "")]
+    assert inner.rows() == [("inner",)]
+    assert all(dtype == pl.String for dtype in first.dtypes)
+
+
+def test_min_rows_skips_small_tables():
+    assert [t.height for t in extract_tables(PAGE, min_rows=2)] == [3]
+    assert get_relevant_tables(html=PAGE).is_empty()
+
+    rows = "".join(f"<tr><td>{i}</td></tr>" for i in range(21))
+    relevant = get_relevant_tables(html=f"{PAGE}<table>{rows}</table>")
+    assert relevant["0"].to_list() == [str(i) for i in range(21)]
+
+
+@pytest.mark.parametrize("page", ["assets/spa/1.html", "assets/spa/response1.html"])
+def test_net_production_scan_matches_table_pipeline(page):
+    with open(page, encoding="utf-8") as f:
+        html = f.read()
+
+    expected = net_production_from_tables(scrape_data_spa(html=html))
+    assert expected in (36_470_000, 360_400)
+    assert find_net_production(html) == expected
+
+
+def test_net_production_scan_needs_time_range_block():
+    cell = "<td>Net production:&nbsp;1.5 k, &nbsp;Theo. prod.</td>"
+    assert find_net_production(cell) is None
+    assert find_net_production(f"<b>Time range</b>{cell}") == 1_500
+    assert find_net_production("<b>Time range</b><td>Net production:</td>") is None